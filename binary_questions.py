@@ -1,21 +1,48 @@
 import re
-import datetime
-from prompts_gpt5 import BINARY_PROMPT_TEMPLATE, BINARY_META_PROMPT_TEMPLATE
+import asyncio
+import functools
+import logging
+import statistics
+from prompts_gpt5 import render_binary_prompt, render_binary_meta_prompt, today_string
 from llm_calls import call_gpt5_reasoning_text, create_rationale_summary
 
+logger = logging.getLogger(__name__)
+
 # Non-breaking / narrow spaces that sometimes appear before the '%' sign
 NBSPS = ("\u00A0", "\u202F", "\u2009", "\u2007")
+NBSP_TABLE = str.maketrans({sp: " " for sp in NBSPS})
 
 # Regex to locate the exact line that contains the final probability.
 # Supports both:
 #   "Probability: 37.50%" (standard template)
 #   "6) Probability: 37.50%" (meta template)
 PROB_LINE = re.compile(r"(?mi)^\s*(?:\d+\s*[\)\.]\s*)?Probability\s*:.*$")
+# Any casing of the label word; an earlier hit means PROB_LINE may match before the literal label.
+PROB_WORD = re.compile(r"probability", re.I)
 
 # Regex to extract a numeric value on that line; accepts optional '%' and decimals
 PROB_VALUE = re.compile(r"Probability\s*:\s*([0-9]+(?:[.,][0-9]+)?)\s*%?", re.I)
 
+# Regex to turn a decimal comma into a dot (e.g., "93,0" -> "93.0")
+DECIMAL_COMMA = re.compile(r"(\d),(\d)")
+
+# Patterns that indicate meta-questions (matched against the lowercased title).
+# Fused into a single alternation so the title is scanned in one pass.
+META_PATTERNS = (
+    r"community prediction.*(?:higher|lower|greater|less|exceed|above|below|at least).*\d+(?:\.\d+)?%",
+    r"(?:will|does).*community prediction.*\d+(?:\.\d+)?%",
+    r"metaculus.*community prediction.*\d+(?:\.\d+)?%",
+    r"cp.*(?:higher|lower|greater|less|exceed|above|below|at least).*\d+(?:\.\d+)?%",
+)
+META_COMBINED = re.compile("|".join(f"(?:{pattern})" for pattern in META_PATTERNS))
+
+# Model outputs longer than this are parsed in a worker thread so a slow regex
+# fallback does not stall the event loop. `re` holds the GIL, so this bounds the
+# stall via the interpreter's switch interval rather than running in parallel.
+EXTRACTION_OFFLOAD_CHARS = 20_000
+
 
+@functools.lru_cache(maxsize=4096)
 def is_meta_question(title: str) -> bool:
     """
     Detect if this is a meta-question about community predictions.
@@ -23,34 +50,33 @@ def is_meta_question(title: str) -> bool:
     """
     # Convert to lowercase for case-insensitive matching
     title_lower = title.lower()
-    
-    # Patterns that indicate meta-questions
-    meta_patterns = [
-        r"community prediction.*(?:higher|lower|greater|less|exceed|above|below|at least).*\d+(?:\.\d+)?%",
-        r"(?:will|does).*community prediction.*\d+(?:\.\d+)?%",
-        r"metaculus.*community prediction.*\d+(?:\.\d+)?%",
-        r"cp.*(?:higher|lower|greater|less|exceed|above|below|at least).*\d+(?:\.\d+)?%",
-    ]
-    
-    # Check if any pattern matches
-    for pattern in meta_patterns:
-        if re.search(pattern, title_lower):
-            return True
-    
-    return False
+
+    # Cheap prefilter: every pattern needs a percentage and either
+    # "community prediction" or "cp", so most titles never reach the regex.
+    if "%" not in title_lower:
+        return False
+    if "community prediction" not in title_lower and "cp" not in title_lower:
+        return False
+
+    return META_COMBINED.search(title_lower) is not None
 
 
 def extract_probability_from_response_as_percentage_not_decimal(
     forecast_text: str,
 ) -> float:
-    matches = re.findall(r"(\d+)%", forecast_text)
-    if matches:
-        # Return the last number found before a '%'
-        number = int(matches[-1])
-        number = min(99, max(1, number))  # clamp the number between 1 and 99
-        return number
-    else:
-        raise ValueError(f"Could not extract prediction from response: {forecast_text}")
+    # Walk backwards from the last '%' to find the last number written before a '%';
+    # the probability sits at the end of the answer, so this avoids scanning it all.
+    pct = forecast_text.rfind("%")
+    while pct != -1:
+        start = pct
+        while start > 0 and forecast_text[start - 1].isdecimal():
+            start -= 1
+        if start < pct:
+            number = int(forecast_text[start:pct])
+            number = min(99, max(1, number))  # clamp the number between 1 and 99
+            return number
+        pct = forecast_text.rfind("%", 0, pct)
+    raise ValueError(f"Could not extract prediction from response: {forecast_text}")
 
 
 def extract_probability_percent(text: str, clamp_min=1.0, clamp_max=99.0, decimals=2):
@@ -65,18 +91,33 @@ def extract_probability_percent(text: str, clamp_min=1.0, clamp_max=99.0, decima
     Returns (value_in_percent, status), where status is 'ok' or a failure reason.
     """
 
-    # 1) Normalize any exotic unicode spaces to plain ASCII spaces
-    for sp in NBSPS:
-        text = text.replace(sp, " ")
-
-    # 2) Restrict parsing to the specific line that contains "Probability:"
-    mline = PROB_LINE.search(text)
-    if not mline:
-        return None, "no-prob-line"
-    line = mline.group(0)
+    # 1) Restrict parsing to the specific line that contains "Probability:".
+    #    Fast path: locate the literal label with str.find and only accept it when
+    #    it starts the line (optionally after a "6)" style prefix) and no other casing
+    #    or spacing of the label appears before it; otherwise fall back to scanning the
+    #    whole text with PROB_LINE, so the first matching line still wins.
+    line = None
+    idx = text.find("Probability:")
+    if idx != -1 and not PROB_WORD.search(text, 0, idx):
+        line_start = text.rfind("\n", 0, idx) + 1
+        line_end = text.find("\n", idx)
+        if line_end == -1:
+            line_end = len(text)
+        candidate = text[line_start:line_end]
+        if not text[line_start:idx].strip() or PROB_LINE.match(candidate):
+            line = candidate
+    if line is None:
+        mline = PROB_LINE.search(text)
+        if not mline:
+            return None, "no-prob-line"
+        line = mline.group(0)
+
+    # 2) Normalize any exotic unicode spaces on that line to plain ASCII spaces
+    if any(sp in line for sp in NBSPS):
+        line = line.translate(NBSP_TABLE)
 
     # 3) Convert decimal comma to dot on that line (e.g., "93,0" -> "93.0")
-    line_norm = re.sub(r'(\d),(\d)', r'\1.\2', line)
+    line_norm = DECIMAL_COMMA.sub(r'\1.\2', line)
 
     # 4) Extract the numeric portion; '%' is optional
     m = PROB_VALUE.search(line_norm)
@@ -101,7 +142,7 @@ async def get_binary_gpt_prediction(
     question_details: dict, num_runs: int, run_research_func
 ) -> tuple[float, str]:
 
-    today = datetime.datetime.now().strftime("%Y-%m-%d")
+    today = today_string()
     title = question_details["title"]
     resolution_criteria = question_details["resolution_criteria"]
     background = question_details["description"]
@@ -113,15 +154,14 @@ async def get_binary_gpt_prediction(
     is_meta = is_meta_question(title)
     if is_meta:
         # Use specialized template for meta-questions about community predictions
-        template = BINARY_META_PROMPT_TEMPLATE
-        print(f"🎯 DETECTED META-QUESTION: Using BINARY_META_PROMPT_TEMPLATE")
-        print(f"   Title: {title}")
+        render_prompt = render_binary_meta_prompt
+        logger.debug("🎯 DETECTED META-QUESTION: Using BINARY_META_PROMPT_TEMPLATE (title: %s)", title)
     else:
         # Use standard template for regular binary questions
-        template = BINARY_PROMPT_TEMPLATE
-        print(f"📊 Standard binary question: Using BINARY_PROMPT_TEMPLATE")
+        render_prompt = render_binary_prompt
+        logger.debug("📊 Standard binary question: Using BINARY_PROMPT_TEMPLATE")
 
-    content = template.format(
+    content = render_prompt(
         title=title,
         today=today,
         background=background,
@@ -130,58 +170,80 @@ async def get_binary_gpt_prediction(
         summary_report=summary_report,
     )
 
-    async def get_rationale_and_probability(content: str) -> tuple[float, str]:
+    # The Responses API has no `n` parameter, so the runs stay separate requests;
+    # a shared cache key lets them reuse the same cached prompt prefix instead.
+    prompt_cache_key = f"binary-{question_details.get('id', title)}"
+
+    async def get_rationale_and_probability(content: str) -> tuple[float, str, str]:
         last_rationale = None
         last_status = None
 
         # Small retry loop to handle occasional format drift.
         for _ in range(3):
             rationale = await call_gpt5_reasoning_text(
-                content, reasoning_effort="medium", verbosity="medium"
+                content,
+                reasoning_effort="medium",
+                verbosity="medium",
+                prompt_cache_key=prompt_cache_key,
             )
             last_rationale = rationale
-            probability, status = extract_probability_percent(rationale)
+            if len(rationale) > EXTRACTION_OFFLOAD_CHARS:
+                probability, status = await asyncio.to_thread(
+                    extract_probability_percent, rationale
+                )
+            else:
+                probability, status = extract_probability_percent(rationale)
             last_status = status
             if probability is not None:
                 comment = (
                     f"Extracted Probability: {probability}%\n\nGPT's Answer: "
                     f"{rationale}\n\n\n"
                 )
-                return probability, comment
+                return probability, rationale, comment
 
         raise ValueError(
             f"Could not extract probability from model output (status={last_status}). "
             f"Model output starts with: {str(last_rationale)[:300]}"
         )
 
-    import asyncio
-    import numpy as np
-
-    probability_and_comment_pairs = await asyncio.gather(
-        *[get_rationale_and_probability(content) for _ in range(num_runs)]
+    # TaskGroup cancels the remaining runs as soon as one fails instead of
+    # letting them keep consuming rate-limiter slots. The first failure is re-raised
+    # unwrapped so the per-question error report shows the real cause.
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(get_rationale_and_probability(content))
+                for _ in range(num_runs)
+            ]
+    except* Exception as eg:
+        raise eg.exceptions[0]
+    probabilities, rationales, comments = map(
+        list, zip(*(task.result() for task in tasks))
     )
-    comments = [pair[1] for pair in probability_and_comment_pairs]
-    final_comment_sections = [
-        f"## Rationale {i+1}\n{comment}" for i, comment in enumerate(comments)
-    ]
-    probabilities = [pair[0] for pair in probability_and_comment_pairs]
-    median_probability = float(np.median(probabilities)) / 100
+    median_probability = statistics.median(probabilities) / 100
 
-    # Create consolidated summary if multiple runs
-    consolidated_summary = ""
+    # Start the consolidated summary (if multiple runs) right away so it runs
+    # while the rest of the comment is assembled; await it only when needed.
+    summary_task = None
     if num_runs > 1:
-        rationales = [pair[1].split("GPT's Answer: ", 1)[1] if "GPT's Answer: " in pair[1] else pair[1] for pair in probability_and_comment_pairs]
-        consolidated_summary = await create_rationale_summary(
-            rationales=rationales,
-            question_title=title,
-            question_type="binary",
-            final_prediction=f"{median_probability:.2%}",
-            source_urls=source_urls
+        summary_task = asyncio.create_task(
+            create_rationale_summary(
+                rationales=rationales,
+                question_title=title,
+                question_type="binary",
+                final_prediction=f"{median_probability:.2%}",
+                source_urls=source_urls
+            )
         )
 
+    final_comment_sections = [
+        f"## Rationale {i+1}\n{comment}" for i, comment in enumerate(comments)
+    ]
+
     # Build final comment with consolidated summary if available
     final_comment_parts = [f"Median Probability: {median_probability}"]
-    
+
+    consolidated_summary = await summary_task if summary_task else ""
     if consolidated_summary:
         final_comment_parts.append(f"\n## Consolidated Analysis\n{consolidated_summary}")
     
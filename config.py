@@ -10,4 +10,10 @@ PERPLEXITY_API_KEY = os.getenv("PERPLEXITY_API_KEY")
 ASKNEWS_CLIENT_ID = os.getenv("ASKNEWS_CLIENT_ID")
 ASKNEWS_SECRET = os.getenv("ASKNEWS_SECRET")
 EXA_API_KEY = os.getenv("EXA_API_KEY")
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
\ No newline at end of file
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+# Tuning
+# Print CDF sparklines/plots/diagnostics even when stdout is not a terminal (e.g., CI logs)
+METAC_DIAG = os.getenv("METAC_DIAG", "").lower() in ("1", "true")
+# Max concurrent OpenAI requests across the whole process (see llm_calls.py)
+LLM_CONCURRENT_REQUESTS_LIMIT = int(os.getenv("LLM_CONCURRENT_REQUESTS_LIMIT", "20"))
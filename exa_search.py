@@ -1,10 +1,20 @@
 import re
+import asyncio
+import hashlib
+import shelve
+import threading
 from exa_py import Exa
-from prompts_gpt5 import SEARCH_QUERIES_PROMPT
+from prompts_gpt5 import SEARCH_QUERIES_PROMPT_STATIC, render_search_queries_prompt, today_string
 from prompts_gpt5 import EXA_SUMMARY_PROMPT
 from config import EXA_API_KEY
 
 NUM_SEARCH_QUERIES = 5
+# One pass over the query-generation output: "START_DATE: ..." and "QUERY_<n>: ..." lines.
+SEARCH_QUERY_OUTPUT_LINE = re.compile(
+    r"^[ \t]*(?:START_DATE:(?P<start_date>.*)|QUERY_[^:\n]*:(?P<query>.*))$", re.M
+)
+NO_RELEVANT_CONTENT = re.compile(r"no\s+relevant\s+content\s+found", re.I)
+SEARCH_QUERY_CACHE_PATH = ".search_query_cache"  # Generated queries reused for identical prompts on the same day
 
 
 def _truncate(text: str | None, max_chars: int) -> str:
@@ -16,6 +26,55 @@ def _truncate(text: str | None, max_chars: int) -> str:
     return text[: max_chars - 3] + "..."
 
 
+# SHA-256 state after the static prompt prefix; keys only hash the per-question tail on top.
+_SEARCH_QUERIES_STATIC_SHA256 = hashlib.sha256(SEARCH_QUERIES_PROMPT_STATIC.encode("utf-8"))
+
+
+def _search_query_cache_key(prompt: str) -> str:
+    """sha256(prompt), resuming from the precomputed static-prefix state when possible."""
+    if prompt.startswith(SEARCH_QUERIES_PROMPT_STATIC):
+        digest = _SEARCH_QUERIES_STATIC_SHA256.copy()
+        digest.update(prompt[len(SEARCH_QUERIES_PROMPT_STATIC):].encode("utf-8"))
+    else:
+        digest = hashlib.sha256(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+# Shelve files do not support concurrent access, and lookups run in worker threads.
+_search_query_cache_lock = threading.Lock()
+_search_query_cache_purged = False  # Entries from earlier days are dropped once per process
+
+
+def _load_cached_search_query_response(prompt: str, today: str) -> str | None:
+    global _search_query_cache_purged
+    key = _search_query_cache_key(prompt)
+    with _search_query_cache_lock, shelve.open(SEARCH_QUERY_CACHE_PATH) as db:
+        if not _search_query_cache_purged:
+            for stale_key in [stale_key for stale_key, (day, _) in db.items() if day != today]:
+                del db[stale_key]
+            _search_query_cache_purged = True
+        hit = db.get(key)
+    return hit[1] if hit is not None and hit[0] == today else None
+
+
+def _store_search_query_response(prompt: str, response: str, today: str) -> None:
+    key = _search_query_cache_key(prompt)
+    with _search_query_cache_lock, shelve.open(SEARCH_QUERY_CACHE_PATH) as db:
+        db[key] = (today, response)
+
+
+async def load_cached_search_query_response(prompt: str) -> str | None:
+    """
+    Return the query-generation response stored today (UTC, as in the prompts' Today line)
+    for this exact prompt, if any. The shelve I/O runs in a worker thread.
+    """
+    return await asyncio.to_thread(_load_cached_search_query_response, prompt, today_string())
+
+
+async def store_search_query_response(prompt: str, response: str) -> None:
+    await asyncio.to_thread(_store_search_query_response, prompt, response, today_string())
+
+
 async def generate_search_queries(question: str | dict, num_queries: int = 3) -> tuple[list[str], str]:
     """
     Use OpenAI to generate optimized search queries and suggest the most appropriate start date for the search.
@@ -34,7 +93,7 @@ async def generate_search_queries(question: str | dict, num_queries: int = 3) ->
         resolution_criteria = ""
         fine_print = ""
 
-    prompt = SEARCH_QUERIES_PROMPT.format(
+    prompt = render_search_queries_prompt(
         num_queries=num_queries,
         title=title,
         background=background,
@@ -43,26 +102,28 @@ async def generate_search_queries(question: str | dict, num_queries: int = 3) ->
     )
     
     try:
-        response = await call_openAI(prompt, temperature=0.1)
-        
-        print(f"OpenAI response for search query generation:\n{response}\n" + "="*50)
+        response = await load_cached_search_query_response(prompt)
+        if response is None:
+            response = await call_openAI(prompt, temperature=0.1)
+            print(f"OpenAI response for search query generation:\n{response}\n" + "="*50)
+        else:
+            print(f"Reusing cached search queries for: {title}")
         
         # Parse the response
-        lines = [line.strip() for line in response.split('\n') if line.strip()]
-        
         start_date = "2023-01-01T00:00:00.000Z"  # default
         queries = []
         
-        for line in lines:
-            if line.startswith("START_DATE:"):
-                start_date = line.replace("START_DATE:", "").strip()
-            elif line.startswith("QUERY_"):
-                query = line.split(":", 1)[1].strip() if ":" in line else line
-                queries.append(query)
+        for match in SEARCH_QUERY_OUTPUT_LINE.finditer(response):
+            if match["query"] is not None:
+                queries.append(match["query"].strip())
+            else:
+                start_date = match["start_date"].strip()
         
         # Fallback if parsing fails
         if not queries:
             queries = [question]
+        else:
+            await store_search_query_response(prompt, response)
             
         return queries[:num_queries] if len(queries) >= num_queries else queries, start_date
         
@@ -71,11 +132,23 @@ async def generate_search_queries(question: str | dict, num_queries: int = 3) ->
         return [question], "2023-01-01T00:00:00.000Z"
 
 
+_exa_client: Exa | None = None
+
+
+def _get_exa_client() -> Exa:
+    """Return the shared Exa client, creating it on first use."""
+    global _exa_client
+    if _exa_client is None:
+        _exa_client = Exa(api_key=EXA_API_KEY)
+    return _exa_client
+
+
 def call_exa_search(query: str, start_published_date: str = "2023-01-01T00:00:00.000Z") -> dict:
     """
     Perform a single Exa search with the given query and start date.
+    Exa summarizes every returned page server-side with the same static EXA_SUMMARY_PROMPT.
     """
-    exa = Exa(api_key=EXA_API_KEY)
+    exa = _get_exa_client()
     response = exa.search_and_contents(
         query=query,
         start_published_date=start_published_date,
@@ -106,11 +179,19 @@ async def run_exa_research(question: str | dict) -> str:
     seen_urls = set()
     all_unique_results = []
     
+    # Issue every query's search (and its per-page summaries) at once instead of one
+    # round trip after another. exa-py's client is synchronous, so each runs in a worker thread.
+    search_responses = await asyncio.gather(
+        *[asyncio.to_thread(call_exa_search, query, start_date) for query in search_queries],
+        return_exceptions=True,
+    )
+
     try:
-        # Collect all results from all queries
-        for i, query in enumerate(search_queries, 1):
+        # Collect all results from all queries, in query order
+        for i, (query, search_data) in enumerate(zip(search_queries, search_responses), 1):
             try:
-                search_data = call_exa_search(query, start_date)
+                if isinstance(search_data, BaseException):
+                    raise search_data
 
                 # Handle SearchResponse object from exa-py
                 if hasattr(search_data, 'results'):
@@ -147,7 +228,7 @@ async def run_exa_research(question: str | dict) -> str:
 
                     # Filter out results with no relevant content and avoid duplicates
                     # Use regex to catch variations of "no relevant content found"
-                    if url and url not in seen_urls and not re.search(r'no\s+relevant\s+content\s+found', summary.lower()):
+                    if url and url not in seen_urls and not NO_RELEVANT_CONTENT.search(summary):
                         seen_urls.add(url)
                         result_dict['source_query'] = query
                         result_dict['query_number'] = i
@@ -1,26 +1,77 @@
 import asyncio
+import functools
+import re
 from openai import AsyncOpenAI
+from config import LLM_CONCURRENT_REQUESTS_LIMIT
 
-CONCURRENT_REQUESTS_LIMIT = 5
+# Global cap on in-flight OpenAI requests. Every forecast run goes through this
+# semaphore, so it must be at least num_runs x concurrently forecasted questions
+# for the runs to actually overlap; keep it below what your account's rate limits
+# allow or the SDK retries will eat the gain. Override with LLM_CONCURRENT_REQUESTS_LIMIT.
+CONCURRENT_REQUESTS_LIMIT = LLM_CONCURRENT_REQUESTS_LIMIT
 llm_rate_limiter = asyncio.Semaphore(CONCURRENT_REQUESTS_LIMIT)
 
+_openai_client: AsyncOpenAI | None = None
 
-def _model_supports_reasoning_config(model: str) -> bool:
-    return model.startswith("gpt-5") or model.startswith("o")
 
+def _get_client() -> AsyncOpenAI:
+    """
+    Return the shared AsyncOpenAI client, creating it on first use.
+
+    Reusing one client keeps its HTTP connection pool (keep-alive, TLS sessions)
+    across calls instead of paying a fresh handshake per request.
+    """
+    global _openai_client
+    if _openai_client is None:
+        # Remove the base_url parameter to call the OpenAI API directly
+        # Also checkout the package 'litellm' for one function that can call any model from any provider
+        # Email ben@metaculus.com if you need credit for the Metaculus OpenAI/Anthropic proxy
+        _openai_client = AsyncOpenAI(
+            # base_url="https://llm-proxy.metaculus.com/proxy/openai/v1",
+            # default_headers={
+            #     "Content-Type": "application/json",
+            #     "Authorization": f"Token {METACULUS_TOKEN}",
+            # },
+            # api_key="Fake API Key since openai requires this not to be NONE. This isn't used",
+            max_retries=2,
+        )
+    return _openai_client
 
-def _simple_reasoning_effort_for_model(model: str) -> str:
-    """Pick the lowest supported reasoning effort for the given model."""
-    # GPT-5.2 family supports "none" as the lowest effort.
+
+@functools.lru_cache(maxsize=32)
+def _reasoning_config_for_model(model: str) -> tuple[bool, str]:
+    """
+    Return (supports_reasoning_config, lowest_reasoning_effort) for the given model.
+
+    Memoized since only a handful of model names are ever used.
+    """
+    # GPT-5.4 family supports "none" as the lowest effort.
     if model.startswith("gpt-5.4"):
-        return "none"
+        return True, "none"
     # Older GPT-5 models use "minimal" as the lowest effort.
     if model.startswith("gpt-5"):
-        return "minimal"
+        return True, "minimal"
     # o-series typically supports low/medium/high; use low for speed.
     if model.startswith("o"):
-        return "low"
-    return "none"
+        return True, "low"
+    return False, "none"
+
+
+def _extract_output_text(response) -> str:
+    """
+    Return the response text, preferring the SDK's `output_text` convenience property.
+
+    Falls back to joining the text of every output content item (single allocation).
+    """
+    text = getattr(response, "output_text", None) or ""
+    if not text and getattr(response, "output", None):
+        text = "".join(
+            content_item.text
+            for item in response.output
+            for content_item in (getattr(item, "content", None) or ())
+            if hasattr(content_item, "text")
+        )
+    return text
 
 
 async def call_openAI(prompt: str, model: str = "gpt-5.4-mini", temperature: float = 0.3) -> str:
@@ -31,18 +82,7 @@ async def call_openAI(prompt: str, model: str = "gpt-5.4-mini", temperature: flo
     For heavier reasoning tasks, prefer `call_gpt5_reasoning_text` / `call_gpt5_reasoning`.
     """
 
-    # Remove the base_url parameter to call the OpenAI API directly
-    # Also checkout the package 'litellm' for one function that can call any model from any provider
-    # Email ben@metaculus.com if you need credit for the Metaculus OpenAI/Anthropic proxy
-    client = AsyncOpenAI(
-        # base_url="https://llm-proxy.metaculus.com/proxy/openai/v1",
-        # default_headers={
-        #     "Content-Type": "application/json",
-        #     "Authorization": f"Token {METACULUS_TOKEN}",
-        # },
-        # api_key="Fake API Key since openai requires this not to be NONE. This isn't used",
-        max_retries=2,
-    )
+    client = _get_client()
 
     # NOTE: Use Responses API for consistency with GPT-5 family.
     async with llm_rate_limiter:
@@ -52,8 +92,8 @@ async def call_openAI(prompt: str, model: str = "gpt-5.4-mini", temperature: flo
             "text": {"verbosity": "low"},
         }
 
-        if _model_supports_reasoning_config(model):
-            effort = _simple_reasoning_effort_for_model(model)
+        supports_reasoning, effort = _reasoning_config_for_model(model)
+        if supports_reasoning:
             params["reasoning"] = {"effort": effort}
             # Docs: temperature/top_p/logprobs are only supported when reasoning.effort == "none".
             if effort == "none":
@@ -64,15 +104,7 @@ async def call_openAI(prompt: str, model: str = "gpt-5.4-mini", temperature: flo
 
         response = await client.responses.create(**params)
 
-        answer = getattr(response, "output_text", None) or ""
-
-        # Fallback: extract aggregated text from output items.
-        if not answer and getattr(response, "output", None):
-            for item in response.output:
-                if hasattr(item, "content"):
-                    for content_item in item.content:
-                        if hasattr(content_item, "text"):
-                            answer += content_item.text
+        answer = _extract_output_text(response)
 
         if not answer:
             raise ValueError("No answer returned from OpenAI")
@@ -85,6 +117,7 @@ async def call_gpt5_reasoning_text(
     reasoning_effort: str = "medium",
     verbosity: str = "medium",
     max_output_tokens: int | None = None,
+    prompt_cache_key: str | None = None,
 ) -> str:
     """Convenience wrapper that returns only the text content."""
     result = await call_gpt5_reasoning(
@@ -93,6 +126,7 @@ async def call_gpt5_reasoning_text(
         reasoning_effort=reasoning_effort,
         verbosity=verbosity,
         max_output_tokens=max_output_tokens,
+        prompt_cache_key=prompt_cache_key,
     )
     return result["content"]
 
@@ -103,6 +137,7 @@ async def call_gpt5_reasoning(
     reasoning_effort: str = "medium",
     verbosity: str = "medium",
     max_output_tokens: int = None,
+    prompt_cache_key: str | None = None,
 ) -> dict:
     """
     Makes a completion request to OpenAI's GPT-5 reasoning model using the Responses API.
@@ -117,6 +152,9 @@ async def call_gpt5_reasoning(
                          Default is "medium". Use "none" for faster responses, "high" or "xhigh" for harder problems.
         verbosity: Controls output length. Options: "low", "medium", "high". Default is "medium".
         max_output_tokens: Maximum tokens in the response (optional)
+        prompt_cache_key: Routing hint for OpenAI prompt caching (optional). Pass the same key
+                          for requests that share a prompt (e.g., repeated runs on one question)
+                          so they land on the same cache and reuse the tokenized prefix.
     
     Returns:
         A dictionary containing:
@@ -126,7 +164,7 @@ async def call_gpt5_reasoning(
     
     Note: Parameters like temperature, top_p, and logprobs are only supported when reasoning_effort="none"
     """
-    client = AsyncOpenAI(max_retries=2)
+    client = _get_client()
     
     # Build request parameters
     params = {
@@ -138,20 +176,15 @@ async def call_gpt5_reasoning(
     
     if max_output_tokens:
         params["max_output_tokens"] = max_output_tokens
+
+    if prompt_cache_key:
+        params["prompt_cache_key"] = prompt_cache_key
     
     async with llm_rate_limiter:
         response = await client.responses.create(**params)
         
-        # Extract the response content (using SDK's convenience property)
-        content = response.output_text if hasattr(response, 'output_text') else ""
-        
-        # If output_text is not available, extract from output array
-        if not content and response.output:
-            for item in response.output:
-                if hasattr(item, 'content'):
-                    for content_item in item.content:
-                        if hasattr(content_item, 'text'):
-                            content += content_item.text
+        # Extract the response content (SDK convenience property, else the output array)
+        content = _extract_output_text(response)
         
         # Extract usage stats
         usage = response.usage if hasattr(response, 'usage') else {}
@@ -165,6 +198,66 @@ async def call_gpt5_reasoning(
         }
 
 
+RATIONALE_LINE_SIMILARITY = 0.85  # Word-set Jaccard above which two rationale lines count as the same point
+_WORD = re.compile(r"\w+")
+# Words that flip or shift a claim: lines whose word sets differ by one of these (or by any
+# number) state different things however similar they are, so they are never merged.
+POLARITY_WORDS = frozenset(
+    {
+        "not", "no", "never", "none", "nor", "neither", "without", "cannot", "t",
+        "likely", "unlikely", "probable", "improbable", "yes",
+        "more", "less", "above", "below", "higher", "lower", "increase", "decrease",
+        "before", "after",
+    }
+)
+
+
+def _same_rationale_point(words: frozenset[str], other: frozenset[str]) -> bool:
+    difference = words ^ other
+    if not difference:
+        return True
+    if difference & POLARITY_WORDS or any(any(c.isdigit() for c in word) for word in difference):
+        return False
+    return len(words & other) >= RATIONALE_LINE_SIMILARITY * len(words | other)
+
+
+def merge_repeated_rationale_lines(rationales: list[str]) -> list[str]:
+    """
+    Collapse lines that (nearly) repeat a line from an earlier rationale. Lines that differ
+    by a negation, a direction word or a number are kept apart (see POLARITY_WORDS).
+
+    The first occurrence is kept and tagged with the rationales that repeated it,
+    e.g. "[also in rationales 3, 5]", so agreement stays visible to the summarizer
+    while the repeated text is sent only once.
+    """
+    kept: list[tuple[int, str, frozenset[str], list[int]]] = []
+    kept_per_rationale: list[list[tuple[int, str, frozenset[str], list[int]]]] = [[] for _ in rationales]
+    for i, rationale in enumerate(rationales):
+        for line in rationale.splitlines():
+            words = frozenset(_WORD.findall(line.lower()))
+            if not words:
+                continue
+            for j, _, kept_words, also_in in kept:
+                if j != i and _same_rationale_point(words, kept_words):
+                    if i + 1 not in also_in:
+                        also_in.append(i + 1)
+                    break
+            else:
+                entry = (i, line.strip(), words, [])
+                kept.append(entry)
+                kept_per_rationale[i].append(entry)
+
+    merged = []
+    for entries in kept_per_rationale:
+        lines = []
+        for _, line, _, also_in in entries:
+            if also_in:
+                line += f" [also in rationales {', '.join(map(str, also_in))}]"
+            lines.append(line)
+        merged.append("\n".join(lines) if lines else "(every point repeats an earlier rationale)")
+    return merged
+
+
 async def create_rationale_summary(rationales: list[str], question_title: str, question_type: str, final_prediction: str, source_urls: list[str] = None) -> str:
     """
     Create a consolidated summary of multiple rationales for a forecasting question.
@@ -183,17 +276,14 @@ async def create_rationale_summary(rationales: list[str], question_title: str, q
         return ""  # No summary needed for single rationale
     
     # Import the prompt template
-    from prompts_gpt5 import RATIONALE_SUMMARY_PROMPT_TEMPLATE
-    
-    # Combine all rationales for analysis
-    combined_rationales = "\n\n---RATIONALE SEPARATOR---\n\n".join([f"Rationale {i+1}:\n{rationale}" for i, rationale in enumerate(rationales)])
+    from prompts_gpt5 import render_rationale_summary_prompt
     
-    prompt = RATIONALE_SUMMARY_PROMPT_TEMPLATE.format(
+    # Send points repeated across runs only once; the renderer numbers and separates them
+    prompt = render_rationale_summary_prompt(
         question_title=question_title,
         question_type=question_type,
         final_prediction=final_prediction,
-        num_rationales=len(rationales),
-        combined_rationales=combined_rationales
+        rationales=merge_repeated_rationale_lines(rationales),
     )
 
     try:
@@ -1,7 +1,12 @@
 import asyncio
-import json
-
-import requests
+import functools
+import re
+import shelve
+import time
+
+import httpx
+import orjson
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 from binary_questions import get_binary_gpt_prediction
 from numeric_questions import get_numeric_gpt_prediction
 from multiple_choice_questions import get_multiple_choice_gpt_prediction
@@ -17,6 +22,9 @@ SUBMIT_PREDICTION = True  # set to True to publish your predictions to Metaculus
 USE_EXAMPLE_QUESTIONS = False  # set to True to forecast example questions rather than the tournament questions
 NUM_RUNS_PER_QUESTION = 5  # The median forecast is taken between NUM_RUNS_PER_QUESTION runs
 SKIP_PREVIOUSLY_FORECASTED_QUESTIONS = True
+MAX_CONCURRENT_QUESTIONS = 8  # Questions forecasted at once; each fans out NUM_RUNS_PER_QUESTION LLM calls plus research
+FORECAST_STATE_PATH = ".forecast_state"  # Local record of posted forecasts, so reruns skip them without any API call
+FORECAST_STATE_MAX_AGE_SECONDS = 30 * 24 * 3600  # Forget entries older than a question's typical open window
 
 
 # The tournament IDs below can be used for testing your bot.
@@ -64,45 +72,149 @@ EXAMPLE_QUESTIONS = [  # (question_id, post_id)
 AUTH_HEADERS = {"headers": {"Authorization": f"Token {METACULUS_TOKEN}"}}
 API_BASE_URL = "https://www.metaculus.com/api"
 
+# Shared async client for all Metaculus API calls, so requests made from concurrently
+# forecasted questions don't block the event loop. Close it with `async with METACULUS_CLIENT:`
+# around the run (see the bottom of this file).
+METACULUS_CLIENT = httpx.AsyncClient(
+    **AUTH_HEADERS,
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    timeout=httpx.Timeout(60.0),
+)
+
+METACULUS_CACHE_TTL_SECONDS = 300  # How long read-only Metaculus GETs are reused within a process
+
+
+def async_ttl_cache(ttl_seconds: float):
+    """
+    Memoize an async function's results per argument tuple for ttl_seconds.
+
+    The wrapped function gets an `invalidate(*args, **kwargs)` helper to drop one entry
+    (e.g., after posting a forecast that changes the cached data).
+    """
+    def decorator(func):
+        cache: dict[tuple, tuple[float, object]] = {}
+
+        def make_key(args, kwargs) -> tuple:
+            return args, tuple(sorted(kwargs.items()))
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = make_key(args, kwargs)
+            hit = cache.get(key)
+            if hit is not None and hit[0] > time.monotonic():
+                return hit[1]
+            result = await func(*args, **kwargs)
+            cache[key] = (time.monotonic() + ttl_seconds, result)
+            return result
+
+        wrapper.invalidate = lambda *args, **kwargs: cache.pop(make_key(args, kwargs), None)
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+
+def is_retryable_metaculus_error(exc: BaseException) -> bool:
+    """
+    Retry timeouts, dropped connections, rate limits and 5xx responses; a 4xx means the
+    request itself is wrong and would fail again.
+    """
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code == 429 or exc.response.is_server_error
+    return isinstance(exc, httpx.TransportError)
+
+
+def is_unsent_metaculus_error(exc: BaseException) -> bool:
+    """
+    Retry only failures where the server cannot have acted on the request: the connection
+    was never established, or the request was rate limited. Used for non-idempotent POSTs,
+    where retrying after a timeout or 5xx could post a duplicate.
+    """
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code == 429
+    return isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout))
+
+
+# Applied below the cache decorators, so only real requests are retried.
+metaculus_retry = retry(
+    stop=stop_after_attempt(4),
+    wait=wait_exponential(multiplier=1, min=1, max=30),
+    retry=retry_if_exception(is_retryable_metaculus_error),
+    reraise=True,
+)
+metaculus_unsent_retry = retry(
+    stop=stop_after_attempt(4),
+    wait=wait_exponential(multiplier=1, min=1, max=30),
+    retry=retry_if_exception(is_unsent_metaculus_error),
+    reraise=True,
+)
+
+
+JSON_HEADERS = {"Content-Type": "application/json"}
 
-def post_question_comment(post_id: int, comment_text: str) -> None:
+
+def encode_json(payload) -> bytes:
+    """
+    Serialize a request body to UTF-8 JSON bytes with orjson (handles NumPy floats/arrays),
+    so httpx sends them as-is instead of running its stdlib json encoder.
+    """
+    return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+@metaculus_unsent_retry
+async def post_question_comment(post_id: int, comment_text: str) -> None:
     """
     Post a comment on the question page as the bot user.
     """
 
-    response = requests.post(
+    response = await METACULUS_CLIENT.post(
         f"{API_BASE_URL}/comments/create/",
-        json={
-            "text": comment_text,
-            "parent": None,
-            "included_forecast": True,
-            "is_private": True,
-            "on_post": post_id,
-        },
-        **AUTH_HEADERS,  # type: ignore
+        content=encode_json(
+            {
+                "text": comment_text,
+                "parent": None,
+                "included_forecast": True,
+                "is_private": True,
+                "on_post": post_id,
+            }
+        ),
+        headers=JSON_HEADERS,
     )
-    if not response.ok:
-        raise RuntimeError(response.text)
+    if not response.is_success:
+        raise httpx.HTTPStatusError(response.text, request=response.request, response=response)
 
 
-def post_question_prediction(question_id: int, forecast_payload: dict) -> None:
+@metaculus_retry
+async def post_question_predictions(forecasts: list[tuple[int, dict]]) -> None:
     """
-    Post a forecast on a question.
+    Post forecasts on several questions in a single request.
+
+    forecasts is a list of (question_id, forecast_payload) pairs; the endpoint accepts an array.
     """
     url = f"{API_BASE_URL}/questions/forecast/"
-    response = requests.post(
+    response = await METACULUS_CLIENT.post(
         url,
-        json=[
-            {
-                "question": question_id,
-                **forecast_payload,
-            },
-        ],
-        **AUTH_HEADERS,  # type: ignore
+        content=encode_json(
+            [
+                {
+                    "question": question_id,
+                    **forecast_payload,
+                }
+                for question_id, forecast_payload in forecasts
+            ]
+        ),
+        headers=JSON_HEADERS,
     )
-    print(f"Prediction Post status code: {response.status_code}")
-    if not response.ok:
-        raise RuntimeError(response.text)
+    print(f"Prediction Post status code: {response.status_code} ({len(forecasts)} forecasts)")
+    if not response.is_success:
+        raise httpx.HTTPStatusError(response.text, request=response.request, response=response)
+
+
+async def post_question_prediction(question_id: int, forecast_payload: dict) -> None:
+    """
+    Post a forecast on a question.
+    """
+    await post_question_predictions([(question_id, forecast_payload)])
 
 
 def create_forecast_payload(
@@ -138,7 +250,9 @@ def create_forecast_payload(
     }
 
 
-def list_posts_from_tournament(
+@async_ttl_cache(METACULUS_CACHE_TTL_SECONDS)
+@metaculus_retry
+async def list_posts_from_tournament(
     tournament_id: int = CURRENT_AI_COMPETITION_ID, offset: int = 0, count: int = 50
 ) -> list[dict]:
     """
@@ -161,18 +275,46 @@ def list_posts_from_tournament(
         "include_description": "true",
     }
     url = f"{API_BASE_URL}/posts/"
-    response = requests.get(url, **AUTH_HEADERS, params=url_qparams)  # type: ignore
-    if not response.ok:
-        raise Exception(response.text)
-    data = json.loads(response.content)
+    response = await METACULUS_CLIENT.get(url, params=url_qparams)
+    if not response.is_success:
+        raise httpx.HTTPStatusError(response.text, request=response.request, response=response)
+    data = orjson.loads(response.content)
     return data
 
 
-def get_open_question_ids_from_tournament(tournament_id: int = CURRENT_AI_COMPETITION_ID) -> list[tuple[int, int]]:
-    posts = list_posts_from_tournament(tournament_id)
+async def iter_posts_from_tournament(
+    tournament_id: int = CURRENT_AI_COMPETITION_ID, page_size: int = 50
+):
+    """
+    Yield every open post from the {tournament_id}, one page of {page_size} at a time.
+    The next page is requested while the current one is being consumed.
+    """
+    offset = 0
+    next_page = asyncio.create_task(
+        list_posts_from_tournament(tournament_id, offset, page_size)
+    )
+    try:
+        while next_page is not None:
+            page = await next_page
+            results = page["results"]
+            offset += page_size
+            next_page = (
+                asyncio.create_task(
+                    list_posts_from_tournament(tournament_id, offset, page_size)
+                )
+                if len(results) == page_size
+                else None
+            )
+            for post in results:
+                yield post
+    finally:
+        if next_page is not None:
+            next_page.cancel()
+
 
+async def get_open_question_ids_from_tournament(tournament_id: int = CURRENT_AI_COMPETITION_ID) -> list[tuple[int, int]]:
     post_dict = dict()
-    for post in posts["results"]:
+    async for post in iter_posts_from_tournament(tournament_id):
         if question := post.get("question"):
             # single question post
             post_dict[post["id"]] = [question]
@@ -190,22 +332,25 @@ def get_open_question_ids_from_tournament(tournament_id: int = CURRENT_AI_COMPET
     return open_question_id_post_id
 
 
-def get_post_details(post_id: int) -> dict:
+@async_ttl_cache(METACULUS_CACHE_TTL_SECONDS)
+@metaculus_retry
+async def get_post_details(post_id: int) -> dict:
     """
     Get all details about a post from the Metaculus API.
     """
     url = f"{API_BASE_URL}/posts/{post_id}/"
     print(f"Getting details for {url}")
-    response = requests.get(
-        url,
-        **AUTH_HEADERS,  # type: ignore
-    )
-    if not response.ok:
-        raise Exception(response.text)
-    details = json.loads(response.content)
+    response = await METACULUS_CLIENT.get(url)
+    if not response.is_success:
+        raise httpx.HTTPStatusError(response.text, request=response.request, response=response)
+    details = orjson.loads(response.content)
     return details
 
 
+# Source URL patterns in the research text: AskNews uses markdown links, Exa "URL: ..." lines.
+MARKDOWN_LINK = re.compile(r'\[(.*?)\]\((https?://[^\)]+)\)')
+EXA_RESULT_URL = re.compile(r'URL: (https?://[^\n\s]+)')
+
 
 async def run_research(question: str | dict) -> tuple[str, list[str]]:
     """
@@ -219,22 +364,21 @@ async def run_research(question: str | dict) -> tuple[str, list[str]]:
 
     # Check for AskNews credentials
     if ASKNEWS_CLIENT_ID and ASKNEWS_SECRET:
-        research = call_asknews(question_text)
+        # AskNews/Perplexity clients are synchronous; run them off the event loop
+        research = await asyncio.to_thread(call_asknews, question_text)
         # Extract URLs from AskNews research (they're in markdown format)
-        import re
-        urls = re.findall(r'\[(.*?)\]\((https?://[^\)]+)\)', research)
+        urls = MARKDOWN_LINK.findall(research)
         source_urls = [url[1] for url in urls]
     # Check for Exa API key
     elif EXA_API_KEY:
         # Use the smart searcher with OpenAI-generated queries
         research = await run_exa_research(question)
         # Extract URLs from Exa research
-        import re
-        urls = re.findall(r'URL: (https?://[^\n\s]+)', research)
+        urls = EXA_RESULT_URL.findall(research)
         source_urls = list(set(urls))  # Remove duplicates
     # Check for Perplexity API key
     elif PERPLEXITY_API_KEY:
-        research = call_perplexity(question_text)
+        research = await asyncio.to_thread(call_perplexity, question_text)
         # Perplexity doesn't provide direct URLs in the response
         source_urls = ["Perplexity AI (sources embedded in response)"]
     else:
@@ -272,8 +416,15 @@ async def forecast_individual_question(
     submit_prediction: bool,
     num_runs_per_question: int,
     skip_previously_forecasted_questions: bool,
-) -> str:
-    post_details = get_post_details(post_id)
+) -> tuple[str, tuple[int, int, dict, str] | None]:
+    """
+    Forecast a single question without posting it.
+
+    Returns (summary_of_forecast, submission) where submission is
+    (question_id, post_id, forecast_payload, comment) if it should be posted, else None.
+    Posting happens in bulk in `forecast_questions`.
+    """
+    post_details = await get_post_details(post_id)
     question_details = post_details["question"]
     title = question_details["title"]
     question_type = question_details["type"]
@@ -291,7 +442,7 @@ async def forecast_individual_question(
         and skip_previously_forecasted_questions == True
     ):
         summary_of_forecast += f"Skipped: Forecast already made\n"
-        return summary_of_forecast
+        return summary_of_forecast, None
 
     if question_type == "binary":
         forecast, comment = await get_binary_gpt_prediction(
@@ -325,11 +476,68 @@ async def forecast_individual_question(
 
     if submit_prediction == True:
         forecast_payload = create_forecast_payload(forecast, question_type)
-        post_question_prediction(question_id, forecast_payload)
-        post_question_comment(post_id, comment)
-        summary_of_forecast += "Posted: Forecast was posted to Metaculus.\n"
+        return summary_of_forecast, (question_id, post_id, forecast_payload, comment)
+
+    return summary_of_forecast, None
 
-    return summary_of_forecast
+
+def load_forecasted_question_ids() -> set[int]:
+    """
+    Return the question ids recorded as forecasted in FORECAST_STATE_PATH,
+    dropping entries older than FORECAST_STATE_MAX_AGE_SECONDS.
+    """
+    cutoff = time.time() - FORECAST_STATE_MAX_AGE_SECONDS
+    with shelve.open(FORECAST_STATE_PATH) as db:
+        for key in [key for key, forecasted_at in db.items() if forecasted_at < cutoff]:
+            del db[key]
+        return {int(key) for key in db.keys()}
+
+
+def record_forecasted_question_ids(question_ids: list[int]) -> None:
+    now = time.time()
+    with shelve.open(FORECAST_STATE_PATH) as db:
+        for question_id in question_ids:
+            db[str(question_id)] = now
+
+
+async def submit_forecasts(
+    submissions: list[tuple[int, int, dict, str]],
+) -> list[Exception | None]:
+    """
+    Post all forecasts in one request, then their comments concurrently.
+
+    If the batched post is rejected, falls back to posting each forecast on its own so one
+    bad payload does not drop the others. Returns one error (or None) per submission.
+    """
+    try:
+        await post_question_predictions(
+            [(question_id, forecast_payload) for question_id, _, forecast_payload, _ in submissions]
+        )
+        errors: list[Exception | None] = [None] * len(submissions)
+    except Exception as e:
+        print(f"Batched forecast post failed ({e}); posting forecasts one by one")
+        errors = list(
+            await asyncio.gather(
+                *[
+                    post_question_prediction(question_id, forecast_payload)
+                    for question_id, _, forecast_payload, _ in submissions
+                ],
+                return_exceptions=True,
+            )
+        )
+
+    async def post_comment_if_forecast_posted(index: int) -> None:
+        if errors[index] is not None:
+            return
+        _, post_id, _, comment = submissions[index]
+        get_post_details.invalidate(post_id)  # cached details no longer reflect my_forecasts
+        await post_question_comment(post_id, comment)
+
+    comment_errors = await asyncio.gather(
+        *[post_comment_if_forecast_posted(i) for i in range(len(submissions))],
+        return_exceptions=True,
+    )
+    return [error or comment_error for error, comment_error in zip(errors, comment_errors)]
 
 
 async def forecast_questions(
@@ -338,17 +546,63 @@ async def forecast_questions(
     num_runs_per_question: int,
     skip_previously_forecasted_questions: bool,
 ) -> None:
+    # Bound how many questions run at once so LLM/research calls don't burst past
+    # provider rate limits and end up in retry storms.
+    question_semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUESTIONS)
+    forecasted_question_ids = (
+        load_forecasted_question_ids() if skip_previously_forecasted_questions else set()
+    )
+
+    async def forecast_with_limit(
+        question_id: int, post_id: int
+    ) -> tuple[str, tuple[int, int, dict, str] | None]:
+        if question_id in forecasted_question_ids:
+            # Known locally to be forecasted already; skip without fetching the post.
+            return (
+                f"-----------------------------------------------\nQuestion ID: {question_id}\n"
+                f"URL: https://www.metaculus.com/questions/{post_id}/\n"
+                f"Skipped: Forecast already made (local cache)\n"
+            ), None
+        async with question_semaphore:
+            return await forecast_individual_question(
+                question_id,
+                post_id,
+                submit_prediction,
+                num_runs_per_question,
+                skip_previously_forecasted_questions,
+            )
+
     forecast_tasks = [
-        forecast_individual_question(
-            question_id,
-            post_id,
-            submit_prediction,
-            num_runs_per_question,
-            skip_previously_forecasted_questions,
-        )
+        forecast_with_limit(question_id, post_id)
         for question_id, post_id in open_question_id_post_id
     ]
-    forecast_summaries = await asyncio.gather(*forecast_tasks, return_exceptions=True)
+    forecast_results = await asyncio.gather(*forecast_tasks, return_exceptions=True)
+
+    # Post every finished forecast in one request instead of one round trip per question.
+    forecast_summaries: list[str | BaseException] = []
+    submission_indices = []
+    submissions = []
+    for i, result in enumerate(forecast_results):
+        if isinstance(result, BaseException):
+            forecast_summaries.append(result)
+            continue
+        forecast_summary, submission = result
+        forecast_summaries.append(forecast_summary)
+        if submission is not None:
+            submission_indices.append(i)
+            submissions.append(submission)
+
+    if submissions:
+        submission_errors = await submit_forecasts(submissions)
+        posted_question_ids = []
+        for i, submission, error in zip(submission_indices, submissions, submission_errors):
+            if error is None:
+                forecast_summaries[i] += "Posted: Forecast was posted to Metaculus.\n"
+                posted_question_ids.append(submission[0])
+            else:
+                forecast_summaries[i] = error
+        record_forecasted_question_ids(posted_question_ids)
+
     print("\n", "#" * 100, "\nForecast Summaries\n", "#" * 100)
 
     errors = []
@@ -374,38 +628,39 @@ async def forecast_questions(
 
 
 ######################## FINAL RUN #########################
-if __name__ == "__main__":
-    if USE_EXAMPLE_QUESTIONS:
-        open_question_id_post_id = EXAMPLE_QUESTIONS
-        
-        asyncio.run(
-            forecast_questions(
+async def run_bot() -> None:
+    async with METACULUS_CLIENT:
+        if USE_EXAMPLE_QUESTIONS:
+            open_question_id_post_id = EXAMPLE_QUESTIONS
+
+            await forecast_questions(
                 open_question_id_post_id,
                 SUBMIT_PREDICTION,
                 NUM_RUNS_PER_QUESTION,
                 SKIP_PREVIOUSLY_FORECASTED_QUESTIONS,
             )
-        )
-    else:
-        # Forecast on both AI Competition and MiniBench tournaments (like main.py)
-        print("Forecasting on AI Competition tournament...")
-        ai_competition_questions = get_open_question_ids_from_tournament(CURRENT_AI_COMPETITION_ID)
-        
-        print("Forecasting on MiniBench tournament...")  
-        minibench_questions = get_open_question_ids_from_tournament(CURRENT_MINIBENCH_ID)
-        
-        # Combine questions from both tournaments
-        all_questions = ai_competition_questions + minibench_questions
-        print(f"Total questions from both tournaments: {len(all_questions)}")
-        
-        if all_questions:
-            asyncio.run(
-                forecast_questions(
+        else:
+            # Forecast on both AI Competition and MiniBench tournaments (like main.py)
+            print("Forecasting on AI Competition and MiniBench tournaments...")
+            ai_competition_questions, minibench_questions = await asyncio.gather(
+                get_open_question_ids_from_tournament(CURRENT_AI_COMPETITION_ID),
+                get_open_question_ids_from_tournament(CURRENT_MINIBENCH_ID),
+            )
+
+            # Combine questions from both tournaments
+            all_questions = ai_competition_questions + minibench_questions
+            print(f"Total questions from both tournaments: {len(all_questions)}")
+
+            if all_questions:
+                await forecast_questions(
                     all_questions,
                     SUBMIT_PREDICTION,
                     NUM_RUNS_PER_QUESTION,
                     SKIP_PREVIOUSLY_FORECASTED_QUESTIONS,
                 )
-            )
-        else:
-            print("No open questions found in either tournament.")
+            else:
+                print("No open questions found in either tournament.")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_bot())
@@ -1,23 +1,47 @@
 import re
-import datetime
-from prompts_gpt5 import MULTIPLE_CHOICE_PROMPT_TEMPLATE
+import asyncio
+from prompts_gpt5 import format_options, render_multiple_choice_prompt, today_string
 from llm_calls import call_gpt5_reasoning_text, create_rationale_summary
 
+# Number extraction pattern for the option probability lines, compiled once at import.
+OPTION_NUMBER = re.compile(r"-?\d+(?:,\d{3})*(?:\.\d+)?")
+# A final-block line: "<option text>: <probability>" with nothing after the number.
+OPTION_PROBABILITY_LINE = re.compile(r"^\s*(?P<label>.+?)\s*:\s*\d*\.?\d+\s*$")
+MAX_FINAL_BLOCK_ATTEMPTS = 2  # Retry a response whose final block the parser would misread once
+
+
+def _normalize_option_label(label: str) -> str:
+    return " ".join(label.strip().strip("\"'*").split()).casefold()
+
+
+def has_complete_final_block(forecast_text: str, options) -> bool:
+    """
+    True if the lines the parser reads (the last len(options) lines containing a number) are
+    "<option>: <probability>" lines for the options, in order. Otherwise a number from the
+    reasoning (or a trailing note) would be taken as an option's probability.
+    """
+    number_lines = [line for line in forecast_text.splitlines() if OPTION_NUMBER.search(line)]
+    final_block = number_lines[-len(options):]
+    if len(final_block) != len(options):
+        return False
+    for line, option in zip(final_block, options):
+        match = OPTION_PROBABILITY_LINE.match(line)
+        if not match or _normalize_option_label(match["label"]) != _normalize_option_label(option):
+            return False
+    return True
+
 
 def extract_option_probabilities_from_response(forecast_text: str, options) -> float:
 
     # Helper function that returns a list of tuples with numbers for all lines with Percentile
     def extract_option_probabilities(text):
 
-        # Number extraction pattern
-        number_pattern = r"-?\d+(?:,\d{3})*(?:\.\d+)?"
-
         results = []
 
         # Iterate through each line in the text
         for line in text.split("\n"):
             # Extract all numbers from the line
-            numbers = re.findall(number_pattern, line)
+            numbers = OPTION_NUMBER.findall(line)
             numbers_no_commas = [num.replace(",", "") for num in numbers]
             # Convert strings to float or int
             numbers = [
@@ -87,7 +111,7 @@ async def get_multiple_choice_gpt_prediction(
     run_research_func,
 ) -> tuple[dict[str, float], str]:
 
-    today = datetime.datetime.now().strftime("%Y-%m-%d")
+    today = today_string()
     title = question_details["title"]
     resolution_criteria = question_details["resolution_criteria"]
     background = question_details["description"]
@@ -96,20 +120,33 @@ async def get_multiple_choice_gpt_prediction(
 
     summary_report, source_urls = await run_research_func(question_details)
 
-    content = MULTIPLE_CHOICE_PROMPT_TEMPLATE.format(
+    content = render_multiple_choice_prompt(
         title=title,
         today=today,
         background=background,
         resolution_criteria=resolution_criteria,
         fine_print=fine_print,
         summary_report=summary_report,
-        options=options,
+        options=format_options(options),
     )
 
+    # All runs send the same prompt; a shared cache key lets them reuse its cached prefix.
+    prompt_cache_key = f"multiple-choice-{question_details.get('id', title)}"
+
     async def ask_llm_for_multiple_choice_probabilities(
         content: str,
     ) -> tuple[dict[str, float], str]:
-        rationale = await call_gpt5_reasoning_text(content, reasoning_effort="medium", verbosity="medium")
+        for attempt in range(1, MAX_FINAL_BLOCK_ATTEMPTS + 1):
+            rationale = await call_gpt5_reasoning_text(
+                content,
+                reasoning_effort="medium",
+                verbosity="medium",
+                prompt_cache_key=prompt_cache_key,
+            )
+            if has_complete_final_block(rationale, options):
+                break
+            if attempt < MAX_FINAL_BLOCK_ATTEMPTS:
+                print("Multiple choice response has no complete final option block; retrying")
 
         option_probabilities = extract_option_probabilities_from_response(
             rationale, options
@@ -125,11 +162,18 @@ async def get_multiple_choice_gpt_prediction(
         )
         return probability_yes_per_category, comment
 
-    import asyncio
-
-    probability_yes_per_category_and_comment_pairs = await asyncio.gather(
-        *[ask_llm_for_multiple_choice_probabilities(content) for _ in range(num_runs)]
-    )
+    # Runs are independent samples, so they all go out at once (bounded by the global
+    # LLM rate limiter); TaskGroup cancels the rest if one fails, and the first failure
+    # is re-raised unwrapped so the per-question error report shows the real cause.
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(ask_llm_for_multiple_choice_probabilities(content))
+                for _ in range(num_runs)
+            ]
+    except* Exception as eg:
+        raise eg.exceptions[0]
+    probability_yes_per_category_and_comment_pairs = [task.result() for task in tasks]
     comments = [pair[1] for pair in probability_yes_per_category_and_comment_pairs]
     final_comment_sections = [
         f"## Rationale {i+1}\n{comment}" for i, comment in enumerate(comments)
@@ -2,6 +2,7 @@
 # Module to build/validate continuous CDFs compatible with Metaculus.
 
 from __future__ import annotations
+import functools
 import numpy as np
 
 
@@ -17,10 +18,15 @@ def _project_bounded_simplex(
     Euclidean projection of d_raw onto the set:
         { d : sum(d) = total,  L <= d_i <= U }.
 
-    Solved via bisection on the Lagrange multiplier because
-    S(λ) = sum(clip(d_raw + λ, L, U)) is monotonic in λ.
+    The solution is clip(d_raw + λ, L, U) for the λ where
+    S(λ) = sum(clip(d_raw + λ, L, U)) equals total. S is monotonic and piecewise
+    linear with breakpoints at L - d_i and U - d_i, so λ is found exactly by
+    sorting the breakpoints, evaluating S at all of them with prefix sums, and
+    solving the linear piece that brackets total (O(n log n), no iteration).
     Returns the projected vector that stays as close as possible (L2) to d_raw.
 
+    tol and max_iter are unused; kept for compatibility with the former bisection.
+
     Technical note: projection onto the “capped simplex”
     (simplex with lower/upper bounds per coordinate).
     """
@@ -29,25 +35,55 @@ def _project_bounded_simplex(
     if n == 0:
         return d_raw.copy()
 
-    # Ensure target sum is feasible.
+    # Ensure target sum is feasible; at either end every coordinate is forced to that bound.
     total = float(np.clip(total, n * L, n * U))
-
-    # Bound λ so that a solution exists within [lo, hi].
-    lo = float(np.min(L - d_raw) - 1.0)
-    hi = float(np.max(U - d_raw) + 1.0)
-
-    for _ in range(max_iter):
-        mid = 0.5 * (lo + hi)
-        s = np.clip(d_raw + mid, L, U).sum()
-        if abs(s - total) <= tol:
-            return np.clip(d_raw + mid, L, U)
-        if s > total:
-            hi = mid
+    if total == n * L:
+        return np.full(n, L, dtype=float)
+    if total == n * U:
+        return np.full(n, U, dtype=float)
+
+    # Sorting d descending sorts both breakpoint families ascending.
+    d_desc = np.sort(d_raw)[::-1]
+    lo_bp = L - d_desc  # below this λ, coordinate sits at L
+    hi_bp = U - d_desc  # above this λ, coordinate sits at U
+    prefix = np.concatenate(([0.0], np.cumsum(d_desc)))
+
+    # S(t) = k_hi*U + (n - k_lo)*L + sum(d over interior) + (k_lo - k_hi)*t
+    bps = np.sort(np.concatenate((lo_bp, hi_bp)))
+    k_lo = np.searchsorted(lo_bp, bps, side="right")
+    k_hi = np.searchsorted(hi_bp, bps, side="right")
+    s_at_bps = k_hi * U + (n - k_lo) * L + (prefix[k_lo] - prefix[k_hi]) + (k_lo - k_hi) * bps
+
+    j = int(np.searchsorted(s_at_bps, total, side="left"))
+    if j == 0:
+        lam = bps[0]
+    elif j >= bps.size:
+        lam = bps[-1]
+    else:
+        # Between bps[j-1] and bps[j] the active sets match those at bps[j-1].
+        a_lo, a_hi = k_lo[j - 1], k_hi[j - 1]
+        slope = a_lo - a_hi
+        if slope == 0:
+            lam = bps[j]
         else:
-            lo = mid
+            lam = (total - a_hi * U - (n - a_lo) * L - (prefix[a_lo] - prefix[a_hi])) / slope
+
+    return np.clip(d_raw + lam, L, U)
+
 
-    # Fallback if not converged within max_iter (very rare with these sizes).
-    return np.clip(d_raw + 0.5 * (lo + hi), L, U)
+@functools.lru_cache(maxsize=8)
+def _gauss_kernel(m: int) -> np.ndarray:
+    """
+    Normalized bell-shaped weights over m steps, centered with sigma = m/4.
+    Cached per length (Metaculus CDFs almost always have m=200); read-only.
+    """
+    idx = np.arange(m)
+    center = 0.5 * (m - 1)
+    sigma = max(m / 4.0, 1.0)  # smooth width
+    w = np.exp(-0.5 * ((idx - center) / sigma) ** 2)
+    w /= w.sum()
+    w.setflags(write=False)
+    return w
 
 
 def _anti_flatten_postpass(
@@ -83,19 +119,39 @@ def _anti_flatten_postpass(
     if cv >= cv_thresh:
         return cdf  # already enough variation: keep as is
 
+    return _anti_flatten_postpass_from_diffs(
+        d,
+        lower=0.001 if open_lower else 0.0,
+        upper=0.999 if open_upper else 1.0,
+        min_step=min_step, max_step=max_step, blend=blend,
+    )
+
+
+def _anti_flatten_postpass_from_diffs(
+    d: np.ndarray,
+    lower: float,
+    upper: float,
+    min_step: float = 5e-05,
+    max_step: float = 0.2,
+    blend: float = 0.20,
+    mass: float | None = None,
+) -> np.ndarray:
+    """
+    Blend a Gaussian kernel into increments d that are already known to be too flat,
+    re-project them onto [lower, upper], and return the rebuilt CDF (len(d) + 1 points).
+    Skips the diff/flatness checks of `_anti_flatten_postpass`.
+
+    mass: sum(d) if the caller already knows it (e.g. d is a projection onto that total).
+    """
     m = len(d)
-    idx = np.arange(m)
-    center = 0.5 * (m - 1)
-    sigma = max(m / 4.0, 1.0)  # smooth width
-    w = np.exp(-0.5 * ((idx - center) / sigma) ** 2)
-    w /= w.sum()
+    w = _gauss_kernel(m)
+    if mass is None:
+        mass = d.sum()
 
     # Blend while preserving total mass (sum(d)).
-    d_tilt = (1.0 - blend) * d + blend * (w * d.sum())
+    d_tilt = (1.0 - blend) * d + blend * (w * mass)
 
     # Re-project to bounds and correct total according to limits.
-    lower = 0.001 if open_lower else 0.0
-    upper = 0.999 if open_upper else 1.0
     total = upper - lower
 
     L = min_step
@@ -104,7 +160,7 @@ def _anti_flatten_postpass(
 
     d_proj = _project_bounded_simplex(d_tilt, total=total, L=L, U=max_step)
 
-    cdf_out = np.empty_like(cdf)
+    cdf_out = np.empty(m + 1)
     cdf_out[0] = lower
     cdf_out[1:] = lower + np.cumsum(d_proj)
     cdf_out[-1] = min(cdf_out[-1], upper)
@@ -137,22 +193,23 @@ def enforce_cdf_constraints(
       - Metaculus typically expects continuous CDFs discretized at 201 points.
       - Run this after your initial interpolation (linear, PCHIP, etc.).
     """
-    cdf_raw = np.asarray(cdf_raw, dtype=float).copy()
+    # No copy: np.clip below already returns a fresh array, so the input is never mutated.
+    cdf_raw = np.asarray(cdf_raw, dtype=float)
     n = len(cdf_raw)
     if n < 2:
-        return cdf_raw
+        return cdf_raw.copy()
 
     # 1) Limits according to 'open'
     lower_limit = 0.001 if open_lower else 0.0
     upper_limit = 0.999 if open_upper else 1.0
 
-    # 2) Basic cleanup: clamp to [0,1] and enforce monotonicity
+    # 2) Basic cleanup: clamp to [0,1] and enforce monotonicity (in place, one buffer)
     c = np.clip(cdf_raw, 0.0, 1.0)
-    c = np.maximum.accumulate(c)
+    np.maximum.accumulate(c, out=c)
 
     # 3) Raw increments and desired mass
-    d_raw = np.diff(c)
-    d_raw = np.maximum(d_raw, 0.0)  # no negative steps
+    # c is non-decreasing, so every step is already >= 0 (no extra clamp pass needed).
+    d_raw = np.subtract(c[1:], c[:-1])
     total = upper_limit - lower_limit
     m = n - 1
 
@@ -164,23 +221,27 @@ def enforce_cdf_constraints(
     # 5) Project onto the bounded simplex: correct sum and per-step bounds
     d_proj = _project_bounded_simplex(d_raw, total=total, L=L, U=max_step)
 
-    # 6) Reconstruct + clamp endpoints
+    # 6) Anti-flatten if the projected increments are too uniform. The check runs on
+    #    d_proj directly, so the common (not flat) case never re-diffs the CDF.
+    mean = d_proj.mean()
+    if mean > 0 and d_proj.std() / (abs(mean) + 1e-12) < 0.10:  # lower to 0.08 if flatness persists
+        return _anti_flatten_postpass_from_diffs(
+            d_proj,
+            lower=lower_limit,
+            upper=upper_limit,
+            min_step=L,              # use the feasible L we computed
+            max_step=max_step,
+            blend=0.20,              # increase to 0.25–0.30 for stronger bell shape
+            mass=mean * m,           # d_proj.sum(), already known from the flatness check
+        )
+
+    # 7) Reconstruct + clamp endpoints
     cdf_fix = np.empty_like(cdf_raw)
     cdf_fix[0] = lower_limit
-    cdf_fix[1:] = lower_limit + np.cumsum(d_proj)
+    np.cumsum(d_proj, out=cdf_fix[1:])
+    cdf_fix[1:] += lower_limit
     cdf_fix[-1] = min(cdf_fix[-1], upper_limit)
 
-    # 7) Anti-flatten post-pass if increments are still too uniform
-    cdf_fix = _anti_flatten_postpass(
-        cdf_fix,
-        open_lower=open_lower,
-        open_upper=open_upper,
-        min_step=L,              # use the feasible L we computed
-        max_step=max_step,
-        cv_thresh=0.10,          # lower to 0.08 if flatness persists
-        blend=0.20               # increase to 0.25–0.30 for stronger bell shape
-    )
-
     return cdf_fix
 
 
@@ -219,19 +280,15 @@ def ascii_plot_cdf(cdf, width: int = 80, height: int = 16, y_ticks=(0.0, 0.5, 1.
     ys = np.interp(xs, np.arange(len(c)), c)
     # Canvas
     H, W = height, width
-    grid = [[" "] * W for _ in range(H)]
+    grid = np.full((H, W), " ", dtype="<U1")
     # Draw CDF points
-    for j, val in enumerate(ys):
-        r = int(round((1.0 - val) * (H - 1)))  # 0=top
-        r = max(0, min(H - 1, r))
-        grid[r][j] = "█"
-    # Grid lines for y_ticks
-    for t in y_ticks:
-        r = int(round((1.0 - t) * (H - 1)))
-        if 0 <= r < H:
-            for j in range(W):
-                if grid[r][j] == " ":
-                    grid[r][j] = "─"
+    rows = np.clip(np.round((1.0 - ys) * (H - 1)).astype(int), 0, H - 1)  # 0=top
+    grid[rows, np.arange(W)] = "█"
+    # Grid lines for y_ticks (ticks outside the canvas are skipped)
+    tick_rows = np.round((1.0 - np.asarray(y_ticks, dtype=float)) * (H - 1)).astype(int)
+    tick_rows = tick_rows[(tick_rows >= 0) & (tick_rows < H)]
+    tick_band = grid[tick_rows]
+    grid[tick_rows] = np.where(tick_band == " ", "─", tick_band)
     # Print with labels
     lines = []
     for i, row in enumerate(grid):
@@ -1,22 +1,29 @@
 import re
-import datetime
+import sys
+import asyncio
 import numpy as np
-from prompts_gpt5 import NUMERIC_PROMPT_TEMPLATE
+from config import METAC_DIAG
+from prompts_gpt5 import numeric_bounds_message, render_numeric_prompt, today_string
 from llm_calls import call_gpt5_reasoning_text, create_rationale_summary
 from numeric_cdf_constrains import enforce_cdf_constraints, pdf_sparkline_from_cdf, cdf_diagnostics, ascii_plot_cdf
 
+# Console CDF previews are only useful to a human watching; skip the work otherwise.
+CDF_DIAGNOSTICS_ENABLED = METAC_DIAG or sys.stdout.isatty()
+
+# Response parsing patterns, compiled once at import.
+PERCENTILE_LINE = re.compile(r"^.*(?:P|p)ercentile.*$")
+PERCENTILE_NUMBER = re.compile(r"-\s*(?:[^\d\-]*\s*)?(\d+(?:,\d{3})*(?:\.\d+)?)|(\d+(?:,\d{3})*(?:\.\d+)?)")
+
 
 def extract_percentiles_from_response(forecast_text: str) -> dict:
 
     # Helper function that returns a list of tuples with numbers for all lines with Percentile
     def extract_percentile_numbers(text) -> dict:
-        pattern = r"^.*(?:P|p)ercentile.*$"
-        number_pattern = r"-\s*(?:[^\d\-]*\s*)?(\d+(?:,\d{3})*(?:\.\d+)?)|(\d+(?:,\d{3})*(?:\.\d+)?)"
         results = []
 
         for line in text.split("\n"):
-            if re.match(pattern, line):
-                numbers = re.findall(number_pattern, line)
+            if PERCENTILE_LINE.match(line):
+                numbers = PERCENTILE_NUMBER.findall(line)
                 numbers_no_commas = [
                     next(num for num in match if num).replace(",", "")
                     for match in numbers
@@ -160,9 +167,10 @@ def generate_continuous_cdf(
     continuous_cdf = enforce_cdf_constraints(continuous_cdf, open_lower_bound, open_upper_bound)
 
     # Console: shape of the PDF (sparkline) and ASCII mini-plot of the CDF
-    print("pdf sparkline:", pdf_sparkline_from_cdf(continuous_cdf))
-    cdf_diagnostics(continuous_cdf)
-    ascii_plot_cdf(continuous_cdf, width=80, height=16, y_ticks=(0.0, 0.25, 0.5, 0.75, 1.0))
+    if CDF_DIAGNOSTICS_ENABLED:
+        print("pdf sparkline:", pdf_sparkline_from_cdf(continuous_cdf))
+        cdf_diagnostics(continuous_cdf)
+        ascii_plot_cdf(continuous_cdf, width=80, height=16, y_ticks=(0.0, 0.25, 0.5, 0.75, 1.0))
 
     return continuous_cdf
 
@@ -171,7 +179,7 @@ async def get_numeric_gpt_prediction(
     question_details: dict, num_runs: int, run_research_func
 ) -> tuple[list[float], str]:
 
-    today = datetime.datetime.now().strftime("%Y-%m-%d")
+    today = today_string()
     title = question_details["title"]
     resolution_criteria = question_details["resolution_criteria"]
     background = question_details["description"]
@@ -191,32 +199,34 @@ async def get_numeric_gpt_prediction(
         cdf_size = 201
     
 
-    # Create messages about the bounds that are passed in the LLM prompt
-    if open_upper_bound:
-        upper_bound_message = ""
-    else:
-        upper_bound_message = f"The outcome can not be higher than {upper_bound}."
-    if open_lower_bound:
-        lower_bound_message = ""
-    else:
-        lower_bound_message = f"The outcome can not be lower than {lower_bound}."
+    # Bound sentence passed at the end of the LLM prompt
+    bounds_message = numeric_bounds_message(
+        lower_bound, upper_bound, open_lower_bound, open_upper_bound
+    )
 
     summary_report, source_urls = await run_research_func(question_details)
 
-    content = NUMERIC_PROMPT_TEMPLATE.format(
+    content = render_numeric_prompt(
         title=title,
         today=today,
         background=background,
         resolution_criteria=resolution_criteria,
         fine_print=fine_print,
         summary_report=summary_report,
-        lower_bound_message=lower_bound_message,
-        upper_bound_message=upper_bound_message,
+        bounds_message=bounds_message,
         units=unit_of_measure,
     )
 
+    # All runs send the same prompt; a shared cache key lets them reuse its cached prefix.
+    prompt_cache_key = f"numeric-{question_details.get('id', title)}"
+
     async def ask_llm_to_get_cdf(content: str) -> tuple[list[float], str]:
-        rationale = await call_gpt5_reasoning_text(content, reasoning_effort="medium", verbosity="medium")
+        rationale = await call_gpt5_reasoning_text(
+            content,
+            reasoning_effort="medium",
+            verbosity="medium",
+            prompt_cache_key=prompt_cache_key,
+        )
         percentile_values = extract_percentiles_from_response(rationale)
 
         comment = (
@@ -237,11 +247,15 @@ async def get_numeric_gpt_prediction(
 
         return cdf, comment
 
-    import asyncio
-
-    cdf_and_comment_pairs = await asyncio.gather(
-        *[ask_llm_to_get_cdf(content) for _ in range(num_runs)]
-    )
+    # Runs are independent samples, so they all go out at once (bounded by the global
+    # LLM rate limiter); TaskGroup cancels the rest if one fails, and the first failure
+    # is re-raised unwrapped so the per-question error report shows the real cause.
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(ask_llm_to_get_cdf(content)) for _ in range(num_runs)]
+    except* Exception as eg:
+        raise eg.exceptions[0]
+    cdf_and_comment_pairs = [task.result() for task in tasks]
     comments = [pair[1] for pair in cdf_and_comment_pairs]
     final_comment_sections = [
         f"## Rationale {i+1}\n{comment}" for i, comment in enumerate(comments)
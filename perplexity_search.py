@@ -1,6 +1,11 @@
 import requests
+from requests.adapters import HTTPAdapter
 from config import PERPLEXITY_API_KEY
 
+# Reuse one keep-alive connection pool instead of a fresh TCP/TLS handshake per call.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
+
 
 def call_perplexity(question: str) -> str:
     """
@@ -35,7 +40,7 @@ def call_perplexity(question: str) -> str:
     }
     
     try:
-        response = requests.post(url=url, json=payload, headers=headers)
+        response = SESSION.post(url=url, json=payload, headers=headers)
         if not response.ok:
             return f"Perplexity API error: {response.status_code} - {response.text}"
         
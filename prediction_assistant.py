@@ -26,6 +26,7 @@ from main_with_no_framework import (
     get_post_details,
     run_research,
     forecast_is_already_made,
+    METACULUS_CLIENT,
 )
 from binary_questions import get_binary_gpt_prediction
 from numeric_questions import get_numeric_gpt_prediction
@@ -89,7 +90,7 @@ async def generate_prediction_for_question(
     Returns:
         dict: Prediction details including forecast and comment, or None if skipped
     """
-    post_details = get_post_details(post_id)
+    post_details = await get_post_details(post_id)
     question_details = post_details["question"]
     title = question_details["title"]
     question_type = question_details["type"]
@@ -163,7 +164,7 @@ async def generate_predictions_for_tournament(tournament_code: str) -> None:
     
     # Get open questions
     print("Fetching open questions from tournament...")
-    open_questions = get_open_question_ids_from_tournament(tournament_id)
+    open_questions = await get_open_question_ids_from_tournament(tournament_id)
     
     if not open_questions:
         message = f"No open questions found in tournament {tournament_id}"
@@ -257,6 +258,12 @@ async def generate_predictions_for_tournament(tournament_code: str) -> None:
     print(f"{'#'*80}\n")
 
 
+async def run_prediction_assistant(tournament_code: str) -> None:
+    """Generate predictions for a tournament, closing the shared Metaculus client afterwards."""
+    async with METACULUS_CLIENT:
+        await generate_predictions_for_tournament(tournament_code)
+
+
 def main():
     """Main entry point for the prediction assistant."""
     if len(sys.argv) < 2:
@@ -272,7 +279,7 @@ def main():
     tournament_code = sys.argv[1]
     
     try:
-        asyncio.run(generate_predictions_for_tournament(tournament_code))
+        asyncio.run(run_prediction_assistant(tournament_code))
     except KeyboardInterrupt:
         print("\n\nPrediction generation interrupted by user.")
         sys.exit(0)
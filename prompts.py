@@ -1,10 +1,10 @@
 # Prompts for the Metaculus forecasting bot
 
-SEARCH_QUERIES_PROMPT = """
-You are a research assistant helping a forecaster find relevant information.
-Given the forecasting question below, you need to:
+from prompts_blocks import FORECASTER_ROLE, GROUNDING_RULE, RESEARCH_ASSISTANT_ROLE
 
-1. Generate {num_queries} different search queries that would help find the most relevant information. Your queries are processed by classical search engines, so please phrase the queries in a way optimal for keyword optimized search (i.e., the phrase you search is likely to appear on desired web pages). Avoid writing overly specific queries. Limit to six words.
+SEARCH_QUERIES_PROMPT_STATIC = "\n" + RESEARCH_ASSISTANT_ROLE + """Given the forecasting question at the end of this message, you need to:
+
+1. Generate the requested number of different search queries that would help find the most relevant information. Your queries are processed by classical search engines, so please phrase the queries in a way optimal for keyword optimized search (i.e., the phrase you search is likely to appear on desired web pages). Avoid writing overly specific queries. Limit to six words.
 2. Suggest the most appropriate start date for searching (in ISO format YYYY-MM-DDTHH:MM:SS.sssZ), using a nuanced and context-aware assessment of the topic domain
 
 Guidelines for search queries:
@@ -20,24 +20,29 @@ Guidelines for estimating the start date:
    - For other domains, select a range that best supports robust forecast-relevant insight, considering how older information might shape outcomes
 - Incorporate the question's anticipated resolution timeframe, and use domain knowledge to justify and support the estimated start date
 
-Question: {question}
-
-Format your response exactly as follows:
+Format your response exactly as follows, with one QUERY line per requested query:
 START_DATE: YYYY-MM-DDTHH:MM:SS.sssZ
 QUERY_1: [first search query]
 QUERY_2: [second search query]
 QUERY_3: [third search query]
+
+"""
+
+SEARCH_QUERIES_PROMPT_DYNAMIC_TEMPLATE = """Number of queries: {num_queries}
+
+Question: {question}
 """
 
-BINARY_PROMPT_TEMPLATE = """
+SEARCH_QUERIES_PROMPT = SEARCH_QUERIES_PROMPT_STATIC + SEARCH_QUERIES_PROMPT_DYNAMIC_TEMPLATE
+
+BINARY_PROMPT_STATIC = """
 # Role and Objective
 - You are a professional forecaster interviewing for a job. Your task is to answer a forecasting interview question with structured reasoning and a clear probability estimate.
 
 # Plan
 - Begin with a concise internal checklist (3–7 bullets) of the major reasoning steps you will follow. Do NOT include this checklist in the final response.
 - Identify key drivers, consider plausible scenarios, and weigh the status quo outcome appropriately.
-- Use only evidence grounded in the Background and the Research Assistant Summary.
-
+""" + GROUNDING_RULE + """
 # Guardrails
 - Make the prediction strictly about the outcome defined in the resolution criteria. Do not drift to related but different targets.
 - If any term or unit is ambiguous, state the assumption explicitly and proceed (no questions).
@@ -60,8 +65,16 @@ BINARY_PROMPT_TEMPLATE = """
 - Clear, concise bullets or short paragraphs (6–10 lines total).
 - End with the exact line: `Probability: ZZ%` (0–100 with two decimals).
 
+# Verbosity
+- Be concise and structured.
+
+# Stop Conditions
+- Once you have written all required reasoning steps and your final probability estimate, conclude your response.
+
 # Context
-### Interview Question:
+"""
+
+BINARY_PROMPT_DYNAMIC_TEMPLATE = """### Interview Question:
 `{title}`
 
 ### Background:
@@ -78,15 +91,11 @@ BINARY_PROMPT_TEMPLATE = """
 
 ### Today's Date
 `{today}`
-
-# Verbosity
-- Be concise and structured.
-
-# Stop Conditions
-- Once you have written all required reasoning steps and your final probability estimate, conclude your response.
 """
 
-BINARY_META_PROMPT_TEMPLATE = """
+BINARY_PROMPT_TEMPLATE = BINARY_PROMPT_STATIC + BINARY_PROMPT_DYNAMIC_TEMPLATE
+
+BINARY_META_PROMPT_STATIC = """
 # Role and Objective
 - You are a professional forecaster. Your task is to decide whether the Community Prediction (CP) of a separate Metaculus base question will exceed a threshold at a specific timestamp. Infer all missing operational details directly from the Title, Background, Resolution Criteria, and the Research Assistant Summary.
 
@@ -122,8 +131,13 @@ BINARY_META_PROMPT_TEMPLATE = """
   • One-line calibration/mapping explanation.  
 - End exactly with: Probability: ZZ% (two decimals).
 
+# Stop Conditions
+- Conclude after the final probability line.
+
 # Context
-### Interview Question:
+"""
+
+BINARY_META_PROMPT_DYNAMIC_TEMPLATE = """### Interview Question:
 {title}
 
 ### Background:
@@ -140,15 +154,11 @@ BINARY_META_PROMPT_TEMPLATE = """
 
 ### Today's Date
 {today}
-
-# Stop Conditions
-- Conclude after the final probability line.
-
 """
 
-NUMERIC_PROMPT_TEMPLATE = """
-You are a professional forecaster interviewing for a job.
+BINARY_META_PROMPT_TEMPLATE = BINARY_META_PROMPT_STATIC + BINARY_META_PROMPT_DYNAMIC_TEMPLATE
 
+NUMERIC_PROMPT_TEMPLATE = "\n" + FORECASTER_ROLE + """
 Begin with a concise checklist (3-7 bullets) outlining your approach to the forecasting task, keeping items conceptual rather than implementation-specific.
 
 You are presented with the following interview question:
@@ -170,8 +180,7 @@ Assistant's Research Summary:
 
 Current Date: {today}
 
-{lower_bound_message}
-{upper_bound_message}
+{bounds_message}
 
 Formatting Guidelines:
 - Pay careful attention to the units required (e.g., present as 1,000,000 or 1m as specified).
@@ -199,10 +208,25 @@ Percentile 90: XX
 "
 """
 
-MULTIPLE_CHOICE_PROMPT_TEMPLATE = """
-You are a professional forecaster interviewing for a job.
+MULTIPLE_CHOICE_PROMPT_STATIC = "\n" + FORECASTER_ROLE + """
+You will be given an interview question with several options, background, and your research assistant's report at the end of this message.
+
+Before answering you write:
+(a) The time left until the outcome to the question is known.
+(b) The status quo outcome if nothing changed.
+(c) A description of an scenario that results in an unexpected outcome.
+
+You write your rationale remembering that (1) good forecasters put extra weight on the status quo outcome since the world changes slowly most of the time, and (2) good forecasters leave some moderate probability on most options to account for unexpected outcomes.
+
+The last thing you write is your final probabilities for the N options, in the order they are listed (separated by " | "), as follows without any decoration and replace Option_X with the actual option names:
+Option_A: Probability_A
+Option_B: Probability_B
+...
+Option_N: Probability_N
+
+"""
 
-Your interview question is:
+MULTIPLE_CHOICE_PROMPT_DYNAMIC_TEMPLATE = """Your interview question is:
 {title}
 
 The options are: {options}
@@ -218,21 +242,10 @@ Your research assistant says:
 {summary_report}
 
 Today is {today}.
-
-Before answering you write:
-(a) The time left until the outcome to the question is known.
-(b) The status quo outcome if nothing changed.
-(c) A description of an scenario that results in an unexpected outcome.
-
-You write your rationale remembering that (1) good forecasters put extra weight on the status quo outcome since the world changes slowly most of the time, and (2) good forecasters leave some moderate probability on most options to account for unexpected outcomes.
-
-The last thing you write is your final probabilities for the N options in this order {options} as follows without any decoration and replace Option_X with the actual option names:
-Option_A: Probability_A
-Option_B: Probability_B
-...
-Option_N: Probability_N
 """
 
+MULTIPLE_CHOICE_PROMPT_TEMPLATE = MULTIPLE_CHOICE_PROMPT_STATIC + MULTIPLE_CHOICE_PROMPT_DYNAMIC_TEMPLATE
+
 RATIONALE_SUMMARY_PROMPT_TEMPLATE = """
 You are analyzing multiple forecasting rationales for the same question to create a consolidated summary. 
 
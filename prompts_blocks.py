@@ -0,0 +1,18 @@
+# Prompt fragments shared verbatim by templates in prompts.py and prompts_gpt5.py.
+#
+# Templates are assembled from these by plain concatenation, so shared openings stay
+# byte-identical across question types and prompt variants (longer common prefixes for
+# provider prompt caching) and wording fixes only have to be made once.
+
+RESEARCH_ASSISTANT_ROLE = "You are a research assistant helping a forecaster find relevant information.\n"
+
+FORECASTER_ROLE = "You are a professional forecaster interviewing for a job.\n"
+
+GROUNDING_RULE = "- Use only evidence grounded in the Background and the Research Assistant Summary.\n"
+
+NO_HIDDEN_REASONING_RULE = "- Do not include hidden reasoning steps; keep rationale concise.\n"
+
+PROBABILITY_LINE_RULE = (
+    "The Probability line must contain a percent sign and exactly two decimals "
+    "(e.g., Probability: 37.50%).\n"
+)
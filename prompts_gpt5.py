@@ -6,11 +6,129 @@
 # - Enforce strict output formatting.
 # - Encourage private reasoning without requesting chain-of-thought disclosure.
 
-SEARCH_QUERIES_PROMPT = """
-You are a research assistant helping a forecaster find relevant information.
-
+import datetime
+import re
+import string
+import unicodedata
+from typing import Callable, Sequence
+
+from prompts_blocks import (
+    FORECASTER_ROLE,
+    GROUNDING_RULE,
+    NO_HIDDEN_REASONING_RULE,
+    PROBABILITY_LINE_RULE,
+    RESEARCH_ASSISTANT_ROLE,
+)
+
+
+# Upper bounds (in estimated tokens) for free-text fields, so one unusually long question
+# description or research dump cannot blow up the prompt size. Set well above typical
+# lengths: they only clip outliers.
+PROMPT_FIELD_MAX_TOKENS = {
+    "background": 1_500,
+    "summary_report": 8_000,
+}
+CHARS_PER_TOKEN = 4  # Rough average for English text with OpenAI tokenizers
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token-count estimate for the field budgets (len() is O(1) on str).
+
+    Precise enough to clip outliers without running a tokenizer over multi-KB fields;
+    dense non-English text is underestimated.
+    """
+    return len(text) // CHARS_PER_TOKEN
+
+# Scraped text carries NBSPs, zero-width characters and CRLF line endings that make
+# otherwise identical prompts differ byte-wise and miss the provider's prompt cache.
+_FIELD_CHAR_MAP = str.maketrans(
+    {
+        "\u00a0": " ",  # no-break space
+        "\u202f": " ",  # narrow no-break space
+        "\u200b": None,  # zero-width space
+        "\u200c": None,
+        "\u200d": None,
+        "\u200e": None,  # left-to-right mark
+        "\u200f": None,  # right-to-left mark
+        "\ufeff": None,  # byte order mark
+    }
+)
+# Runs of spaces/tabs after a non-space character; leading indentation is kept for markdown lists.
+INNER_WHITESPACE = re.compile(r"(?<=\S)[ \t]+")
+
+
+def normalize_prompt_field(text: str) -> str:
+    """
+    Canonicalize a dynamic prompt field: NFC, no invisible characters, "\\n" line endings
+    and single spaces between words.
+    """
+    if not text.isascii():
+        text = unicodedata.normalize("NFC", text).translate(_FIELD_CHAR_MAP)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return INNER_WHITESPACE.sub(" ", text)
+
+
+def _truncate_field(text: str, max_tokens: int) -> str:
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    return text[: max_tokens * CHARS_PER_TOKEN - 3] + "..."
+
+
+def compile_template(
+    template: str, field_max_tokens: dict[str, int] = PROMPT_FIELD_MAX_TOKENS
+) -> Callable[..., str]:
+    """
+    Pre-parse a str.format-style template once and return a render(**fields) callable.
+
+    Rendering joins the cached literal/field segments instead of re-parsing the
+    (multi-KB) template on every call. Only plain `{name}` fields are supported.
+    Field values are passed through normalize_prompt_field, then fields listed in
+    field_max_tokens are clipped to about that many tokens.
+    """
+    segments: list[tuple[str, str | None, int | None]] = []
+    for literal, field_name, format_spec, conversion in string.Formatter().parse(template):
+        if format_spec or conversion:
+            raise ValueError(f"Unsupported format spec in template field: {field_name}")
+        segments.append((literal, field_name, field_max_tokens.get(field_name)))
+
+    def render(**fields: object) -> str:
+        parts: list[str] = []
+        for literal, field_name, max_tokens in segments:
+            parts.append(literal)
+            if field_name is not None:
+                value = normalize_prompt_field(str(fields[field_name]))
+                if max_tokens is not None:
+                    value = _truncate_field(value, max_tokens)
+                parts.append(value)
+        return "".join(parts)
+
+    return render
+
+
+# (UTC date, "YYYY-MM-DD") for the last day a prompt was rendered
+_TODAY_CACHE: tuple[datetime.date, str] | None = None
+
+
+def today_string() -> str:
+    """
+    Today's UTC date as YYYY-MM-DD for the {today} prompt field, formatted once per day.
+
+    Day granularity (and the Today line sitting in every template's tail) keeps a re-run of
+    the same question within the day byte-identical, so it can hit the prompt cache.
+    """
+    global _TODAY_CACHE
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    if _TODAY_CACHE is None or _TODAY_CACHE[0] != today:
+        _TODAY_CACHE = (today, today.strftime("%Y-%m-%d"))
+    return _TODAY_CACHE[1]
+
+
+# Static guidelines first, per-question fields last, so the shared prefix is as long as possible.
+SEARCH_QUERIES_PROMPT_STATIC = "\n" + RESEARCH_ASSISTANT_ROLE + """
 Task
-1) Generate {num_queries} distinct search queries (2–6 words each) suitable for keyword-based search.
+1) Generate the requested number of distinct search queries (2–6 words each) suitable for keyword-based search.
 2) Suggest the most appropriate start date for searching in ISO format: YYYY-MM-DDTHH:MM:SS.sssZ
 
 Guidelines
@@ -25,28 +143,36 @@ Start date heuristics
 - Science/technology: often 2–3 years back (or further if the “origin story” matters).
 - If the question has a near-term resolution window, bias the start date more recent.
 
+Output format (strict; N is the number of queries requested below)
+START_DATE: YYYY-MM-DDTHH:MM:SS.sssZ
+QUERY_1: <2–6 words>
+...
+QUERY_N: <2–6 words>
+
+Do not output anything except the START_DATE and QUERY lines.
+
+"""
+
+SEARCH_QUERIES_PROMPT_DYNAMIC_TEMPLATE = """Number of queries (N): {num_queries}
+
 Input (use this context; some fields may be empty)
 Title: {title}
 Background: {background}
 Resolution criteria: {resolution_criteria}
 Fine print: {fine_print}
-
-Output format (strict)
-START_DATE: YYYY-MM-DDTHH:MM:SS.sssZ
-QUERY_1: <2–6 words>
-...
-QUERY_{num_queries}: <2–6 words>
-
-Do not output anything except the lines above.
 """
 
+SEARCH_QUERIES_PROMPT = SEARCH_QUERIES_PROMPT_STATIC + SEARCH_QUERIES_PROMPT_DYNAMIC_TEMPLATE
+
+render_search_queries_prompt = compile_template(SEARCH_QUERIES_PROMPT)
 
-BINARY_PROMPT_TEMPLATE = """
-You are a professional forecaster interviewing for a job.
 
+# Binary prompts are split into a static rulebook and a dynamic tail holding every
+# per-question field, so the rulebook is a byte-identical prefix on every call and
+# providers can serve it from their prompt cache.
+BINARY_PROMPT_STATIC = "\n" + FORECASTER_ROLE + """
 Rules
-- Use only evidence grounded in the Background and the Research Assistant Summary.
-- Make the prediction strictly about the outcome defined in the Resolution criteria.
+""" + GROUNDING_RULE + """- Make the prediction strictly about the outcome defined in the Resolution criteria.
 - If a term is ambiguous, state a single reasonable assumption and proceed.
 - Do not include hidden reasoning steps; provide only the requested lines.
 - Be conservative: avoid extreme probabilities without overwhelming evidence.
@@ -67,10 +193,11 @@ Write exactly 6 lines, in this order (no extra lines):
 Then write one final line:
 Probability: ZZ.ZZ%
 
-The Probability line must contain a percent sign and exactly two decimals (e.g., Probability: 37.50%).
-
+""" + PROBABILITY_LINE_RULE + """
 Context
-Title: {title}
+"""
+
+BINARY_PROMPT_DYNAMIC_TEMPLATE = """Title: {title}
 Background: {background}
 Resolution criteria: {resolution_criteria}
 Fine print: {fine_print}
@@ -78,8 +205,10 @@ Research summary: {summary_report}
 Today: {today}
 """
 
+BINARY_PROMPT_TEMPLATE = BINARY_PROMPT_STATIC + BINARY_PROMPT_DYNAMIC_TEMPLATE
 
-BINARY_META_PROMPT_TEMPLATE = """
+
+BINARY_META_PROMPT_STATIC = """
 You are a professional forecaster.
 
 Goal
@@ -110,37 +239,21 @@ Write exactly these 6 lines (no extra lines):
 5) Mapping: <one-line heuristic mapping margin/time/volatility to probability; include calibration against extremes>
 6) Probability: ZZ.ZZ%
 
-The Probability line must contain a percent sign and exactly two decimals (e.g., Probability: 37.50%).
-
+""" + PROBABILITY_LINE_RULE + """
 Context
-Title: {title}
-Background: {background}
-Resolution criteria: {resolution_criteria}
-Fine print: {fine_print}
-Research summary: {summary_report}
-Today: {today}
 """
 
+BINARY_META_PROMPT_TEMPLATE = BINARY_META_PROMPT_STATIC + BINARY_PROMPT_DYNAMIC_TEMPLATE
 
-NUMERIC_PROMPT_TEMPLATE = """
-You are a professional forecaster interviewing for a job.
 
-Rules
-- Use only evidence grounded in the Background and the Research Assistant Summary.
-- Do not include hidden reasoning steps; keep rationale concise.
-- Follow the unit/format requirements exactly.
-- Respect any explicit bounds stated in the prompt (upper/lower).
+render_binary_prompt = compile_template(BINARY_PROMPT_TEMPLATE)
+render_binary_meta_prompt = compile_template(BINARY_META_PROMPT_TEMPLATE)
 
-Question
-Title: {title}
-Background: {background}
-Resolution criteria: {resolution_criteria}
-Fine print: {fine_print}
-Answer units: {units}
-Research summary: {summary_report}
-Today: {today}
-{lower_bound_message}
-{upper_bound_message}
+
+NUMERIC_PROMPT_STATIC = "\n" + FORECASTER_ROLE + """
+Rules
+""" + GROUNDING_RULE + NO_HIDDEN_REASONING_RULE + """- Follow the unit/format requirements exactly.
+- Respect any explicit bounds stated at the end of the Question section (upper/lower).
 
 Formatting rules
 - Do not use markdown, bullets, or headings.
@@ -169,29 +282,57 @@ Formatting constraints
 - Each Percentile line must contain exactly one number after the colon (no extra numbers).
 - Percentile values must be non-decreasing (P10 ≤ P20 ≤ P40 ≤ P60 ≤ P80 ≤ P90).
 - If bounds are given, ensure all percentile values respect them.
+
+Question
 """
 
+# Bound sentences keyed by (open_lower_bound, open_upper_bound): a fixed set of shapes with
+# the values spliced in, rendered as the last line of the prompt.
+NUMERIC_BOUND_TEMPLATES = {
+    (True, True): "",
+    (False, True): "The outcome can not be lower than {lower_bound}.",
+    (True, False): "The outcome can not be higher than {upper_bound}.",
+    (False, False): "The outcome can not be lower than {lower_bound}. The outcome can not be higher than {upper_bound}.",
+}
 
-MULTIPLE_CHOICE_PROMPT_TEMPLATE = """
-You are a professional forecaster interviewing for a job.
 
-Rules
-- Use only evidence grounded in the Background and the Research Assistant Summary.
-- Do not include hidden reasoning steps; keep rationale concise.
-- Provide one probability per option; keep non-zero mass on plausible surprises.
+def numeric_bounds_message(
+    lower_bound: float, upper_bound: float, open_lower_bound: bool, open_upper_bound: bool
+) -> str:
+    return NUMERIC_BOUND_TEMPLATES[(bool(open_lower_bound), bool(open_upper_bound))].format(
+        lower_bound=lower_bound, upper_bound=upper_bound
+    )
 
-Formatting rules
-- Do not use markdown, bullets, or headings.
-- IMPORTANT: Do not write any digits (0-9) anywhere before the final output block. Spell quantities in words.
 
-Context
-Title: {title}
-Options (in order): {options}
+NUMERIC_PROMPT_DYNAMIC_TEMPLATE = """Title: {title}
 Background: {background}
 Resolution criteria: {resolution_criteria}
 Fine print: {fine_print}
+Answer units: {units}
 Research summary: {summary_report}
 Today: {today}
+{bounds_message}
+"""
+
+NUMERIC_PROMPT_TEMPLATE = NUMERIC_PROMPT_STATIC + NUMERIC_PROMPT_DYNAMIC_TEMPLATE
+
+render_numeric_prompt = compile_template(NUMERIC_PROMPT_TEMPLATE)
+
+
+def format_options(options: list[str]) -> str:
+    """
+    Canonical one-line form of a question's options for the prompts: "A | B | C".
+    """
+    return " | ".join(str(option).strip() for option in options)
+
+
+MULTIPLE_CHOICE_PROMPT_STATIC = "\n" + FORECASTER_ROLE + """
+Rules
+""" + GROUNDING_RULE + NO_HIDDEN_REASONING_RULE + """- Provide one probability per option; keep non-zero mass on plausible surprises.
+
+Formatting rules
+- Do not use markdown, bullets, or headings.
+- IMPORTANT: Do not write any digits (0-9) anywhere before the final output block. Spell quantities in words.
 
 Before the final probabilities, write exactly 3 lines, in this order (one line each; no digits):
 1) Time: <time left until outcome is known>
@@ -199,15 +340,30 @@ Before the final probabilities, write exactly 3 lines, in this order (one line e
 3) Surprise: <one plausible surprise scenario>
 
 Final output block (must be the last lines you write; no extra text after it):
-- Write exactly one line per option, in the same order as Options.
+- Write exactly one line per option, in the same order as Options (listed under Context, separated by " | ").
 - Each line must contain exactly one number after the colon.
 - Probabilities must be decimals between 0 and 1 (e.g., 0.15); do not use percent signs.
 - Do not include any other numbers, parentheses, ranges, or explanations on these lines.
 
 Format:
 <Option text>: <probability>
+
+Context
+"""
+
+MULTIPLE_CHOICE_PROMPT_DYNAMIC_TEMPLATE = """Title: {title}
+Options (in order): {options}
+Background: {background}
+Resolution criteria: {resolution_criteria}
+Fine print: {fine_print}
+Research summary: {summary_report}
+Today: {today}
 """
 
+MULTIPLE_CHOICE_PROMPT_TEMPLATE = MULTIPLE_CHOICE_PROMPT_STATIC + MULTIPLE_CHOICE_PROMPT_DYNAMIC_TEMPLATE
+
+render_multiple_choice_prompt = compile_template(MULTIPLE_CHOICE_PROMPT_TEMPLATE)
+
 
 RATIONALE_SUMMARY_PROMPT_TEMPLATE = """
 You are consolidating multiple forecasting rationales for the same question into one professional summary.
@@ -243,6 +399,39 @@ Formatting
 Target length: 250–450 words.
 """
 
+RATIONALE_SEPARATOR = "\n\n---RATIONALE SEPARATOR---\n\n"
+
+_RATIONALE_SUMMARY_HEAD, _RATIONALE_SUMMARY_TAIL = RATIONALE_SUMMARY_PROMPT_TEMPLATE.split("{combined_rationales}")
+_render_rationale_summary_head = compile_template(_RATIONALE_SUMMARY_HEAD)
+
+
+def render_rationale_summary_prompt(
+    question_title: str,
+    question_type: str,
+    final_prediction: str,
+    rationales: Sequence[str],
+) -> str:
+    """
+    Render RATIONALE_SUMMARY_PROMPT_TEMPLATE with the numbered rationales written straight
+    into the output parts, instead of first joining them into a combined string that is
+    then copied again into the prompt.
+    """
+    parts = [
+        _render_rationale_summary_head(
+            question_title=question_title,
+            question_type=question_type,
+            final_prediction=final_prediction,
+            num_rationales=len(rationales),
+        )
+    ]
+    for i, rationale in enumerate(rationales):
+        if i:
+            parts.append(RATIONALE_SEPARATOR)
+        parts.append(f"Rationale {i+1}:\n")
+        parts.append(normalize_prompt_field(rationale))
+    parts.append(_RATIONALE_SUMMARY_TAIL)
+    return "".join(parts)
+
 
 EXA_SUMMARY_PROMPT = """
 You are creating a clean, concise summary for a professional forecaster.